@@ -0,0 +1,70 @@
+"""Benchmark query analitik: scan CSV penuh vs database SQLite ber-index.
+
+Setiap query dijalankan dengan cara lama (``load_from_csv`` lalu filter/
+agregasi pandas) dan lewat ``query_products``/``product_summary``. Jalankan
+dari root proyek::
+
+    python -m benchmarks.bench_analytics --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_load import clean_products
+from utils.load import load_from_csv, load_to_sqlite, product_summary, query_products
+
+
+def _best(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(rows=1_000_000, repeat=3):
+    df = clean_products(rows)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "clean.csv")
+        db_path = os.path.join(tmp, "analytics.sqlite")
+        df.to_csv(csv_path, index=False)
+        start = time.perf_counter()
+        load_to_sqlite(df, db_path)
+        results["build sqlite"] = (time.perf_counter() - start, None)
+
+        def csv_average():
+            return load_from_csv(csv_path).groupby("Gender")["Price"].mean()
+
+        def csv_top_hoodies():
+            products = load_from_csv(csv_path)
+            hoodies = products[(products["Size"] == "L") & products["Title"].str.contains("Hoodie")]
+            return hoodies.nlargest(10, "Rating")
+
+        results["avg Price by Gender"] = (_best(csv_average, repeat), _best(lambda: product_summary(db_path), repeat))
+        results["top hoodies size L"] = (
+            _best(csv_top_hoodies, repeat),
+            _best(lambda: query_products(db_path, size="L", title="Hoodie"), repeat),
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.repeat)
+    print(f"{'query':<24}{'csv ms':>12}{'sqlite ms':>12}")
+    for name, (scan, indexed) in results.items():
+        if indexed is None:
+            print(f"{name:<24}{scan * 1000:>12.1f}")
+        else:
+            print(f"{name:<24}{scan * 1000:>12.1f}{indexed * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
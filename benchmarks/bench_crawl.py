@@ -0,0 +1,49 @@
+"""Benchmark crawl sekuensial vs konkuren terhadap server HTTP lokal.
+
+Jalankan dari root proyek::
+
+    python -m benchmarks.bench_crawl --pages 50 --latency 0.05 --workers 8 --parse-workers 4
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import render_pages, serve_pages
+from utils.extract import scrape_fashion_products
+
+
+def run(pages=50, latency=0.05, workers=8, delay=0.0, parse_workers=None):
+    catalog = render_pages(pages)
+    results = {}
+    with serve_pages(catalog, latency=latency) as base_url:
+        for label, kwargs in (
+            ("sequential", {"delay": delay, "workers": 1}),
+            (f"concurrent[{workers}]", {"delay": delay, "workers": workers}),
+        ) + ((
+            (f"split[{workers}+{parse_workers}p]", {"delay": delay, "workers": workers, "parse_workers": parse_workers}),
+        ) if parse_workers else ()):
+            start = time.perf_counter()
+            products = scrape_fashion_products(base_url, **kwargs)
+            elapsed = time.perf_counter() - start
+            results[label] = (elapsed, len(products))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Latensi buatan per respons (detik)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.0, help="Jeda/rate limit per host (detik)")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Tambahkan mode parsing di process pool dengan N proses")
+    args = parser.parse_args(argv)
+
+    results = run(args.pages, args.latency, args.workers, args.delay, args.parse_workers)
+    baseline = results["sequential"][0]
+    print(f"{'mode':<16}{'seconds':>10}{'products':>10}{'speedup':>10}")
+    for label, (elapsed, count) in results.items():
+        print(f"{label:<16}{elapsed:>10.3f}{count:>10}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
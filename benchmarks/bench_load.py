@@ -0,0 +1,80 @@
+"""Benchmark loader: rows/detik untuk to_sql (INSERT multi) dan COPY FROM STDIN.
+
+Tanpa ``--db-url`` jalur to_sql diukur terhadap SQLite lokal dan jalur COPY
+hanya diukur sisi klien (serialisasi CSV bertahap). Dengan ``--db-url``
+kedua metode dijalankan ke PostgreSQL tersebut (gunakan database scratch,
+tabel ``products`` akan terisi). Jalankan dari root proyek::
+
+    python -m benchmarks.bench_load --rows 200000 [--db-url postgresql://...]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from benchmarks.fixtures import generate_scraped_frame
+from utils.load import LOAD_METHODS, _ChunkReader, _iter_csv_chunks, load_to_postgres
+from utils.transform import clean_frame
+
+
+def clean_products(rows, seed=0):
+    return clean_frame(generate_scraped_frame(rows, seed=seed)).reset_index(drop=True)
+
+
+def _rate(rows, seconds):
+    return rows / seconds if seconds else float("inf")
+
+
+def bench_sqlite_to_sql(df):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}")
+        start = time.perf_counter()
+        # Parameter sama dengan jalur to_sql produksi, tanpa schema 'public'.
+        df.to_sql("products", engine, if_exists="append", index=False, method="multi", chunksize=1000)
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+    return elapsed
+
+
+def bench_copy_serialization(df):
+    start = time.perf_counter()
+    reader = _ChunkReader(_iter_csv_chunks(df))
+    while reader.read(1 << 16):
+        pass
+    return time.perf_counter() - start
+
+
+def bench_postgres(df, db_url, method):
+    start = time.perf_counter()
+    load_to_postgres(df, db_url, method=method)
+    return time.perf_counter() - start
+
+
+def run(rows, db_url=None):
+    df = clean_products(rows)
+    results = {
+        "sqlite to_sql": bench_sqlite_to_sql(df),
+        "copy serialize": bench_copy_serialization(df),
+    }
+    if db_url:
+        for method in LOAD_METHODS:
+            results[f"postgres {method}"] = bench_postgres(df, db_url, method)
+    return len(df), results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Jumlah baris mentah sebelum dibersihkan")
+    parser.add_argument("--db-url", help="PostgreSQL scratch untuk membandingkan to_sql dan COPY")
+    args = parser.parse_args(argv)
+
+    rows, results = run(args.rows, args.db_url)
+    print(f"{'method':<18}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    for method, seconds in results.items():
+        print(f"{method:<18}{rows:>10}{seconds:>10.2f}{_rate(rows, seconds):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Micro-benchmark parsing halaman katalog: cards/detik per engine parser.
+
+Jalankan dari root proyek::
+
+    python -m benchmarks.bench_parse --pages 50 --repeat 3
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import render_pages
+from utils.parsers import PARSER_ENGINES, get_parser
+
+
+def run(pages=50, repeat=3, engines=None):
+    catalog = list(render_pages(pages).values())
+    results = {}
+    for engine in engines or sorted(PARSER_ENGINES):
+        parse = get_parser(engine)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cards = sum(len(parse(content)[0]) for content in catalog)
+            best = min(best, time.perf_counter() - start)
+        results[engine] = (cards, best)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engine", action="append", choices=sorted(PARSER_ENGINES))
+    args = parser.parse_args(argv)
+
+    print(f"{'engine':<14}{'cards':>8}{'seconds':>10}{'cards/s':>12}")
+    for engine, (cards, seconds) in run(args.pages, args.repeat, args.engine).items():
+        print(f"{engine:<14}{cards:>8}{seconds:>10.3f}{cards / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
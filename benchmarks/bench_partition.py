@@ -0,0 +1,54 @@
+"""Benchmark transform paralel per partisi: throughput pada 1/2/4/8 worker.
+
+Worker 1 adalah mode biasa (satu proses); selebihnya ``clean_data(...,
+workers=N)``. Data sintetis dipecah menjadi beberapa file harian seperti
+backfill. Jalankan dari root proyek::
+
+    python -m benchmarks.bench_partition --rows 4000000 --files 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import generate_scraped_frame
+from utils.transform import clean_data
+
+
+def run(rows=2_000_000, files=4, workers=(1, 2, 4, 8), output=".csv"):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        frame = generate_scraped_frame(rows)
+        step = -(-rows // files)
+        paths = []
+        for number, start in enumerate(range(0, rows, step)):
+            path = os.path.join(tmp, f"scrape_day{number + 1}.csv")
+            frame.iloc[start:start + step].to_csv(path, index=False)
+            paths.append(path)
+        del frame
+
+        for count in workers:
+            start = time.perf_counter()
+            clean_data(paths, os.path.join(tmp, f"clean-{count}{output}"), workers=count)
+            results[count] = time.perf_counter() - start
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--files", type=int, default=4, help="Jumlah file input (hasil scraping harian)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--output", choices=[".csv", ".parquet"], default=".csv", help="Format output")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.files, args.workers, args.output)
+    base = results.get(1) or next(iter(results.values()))
+    print(f"{os.cpu_count()} CPU, {args.rows} baris dalam {args.files} file")
+    print(f"{'workers':<10}{'seconds':>10}{'rows/s':>12}{'speedup':>10}")
+    for count, seconds in results.items():
+        print(f"{count:<10}{seconds:>10.2f}{args.rows / seconds:>12.0f}{base / seconds:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark memori per produk: list dict (cara lama) vs ``ProductBuffer``.
+
+Halaman katalog sintetis di-parsing seperti saat crawl dan produknya
+ditampung sampai akhir; memori yang masih teralokasi setelahnya diukur
+dengan tracemalloc. Jalankan dari root proyek::
+
+    python -m benchmarks.bench_records --pages 5000 --parser lxml
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fixtures import render_pages
+from utils.parsers import PARSER_ENGINES, parse_rows, rows_to_products
+from utils.records import ProductBuffer
+
+
+def collect_dicts(catalog, parser):
+    products = []
+    for content in catalog:
+        products.extend(rows_to_products(parse_rows(content, parser)[0]))
+    return products, pd.DataFrame
+
+
+def collect_buffer(catalog, parser):
+    buffer = ProductBuffer()
+    for content in catalog:
+        buffer.extend_rows(parse_rows(content, parser)[0])
+    return buffer, ProductBuffer.to_frame
+
+
+VARIANTS = {"dicts": collect_dicts, "buffer": collect_buffer}
+
+
+def measure(collect, catalog, parser):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    products, to_frame = collect(catalog, parser)
+    collect_seconds = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    df = to_frame(products)
+    frame_seconds = time.perf_counter() - start
+    return {"products": len(df), "held_bytes": held, "collect_seconds": collect_seconds,
+            "frame_seconds": frame_seconds}
+
+
+def run(pages=1000, parser=None, variants=tuple(VARIANTS)):
+    catalog = list(render_pages(pages).values())
+    return {variant: measure(VARIANTS[variant], catalog, parser) for variant in variants}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--parser", choices=sorted(PARSER_ENGINES), default=None)
+    args = parser.parse_args(argv)
+
+    # "collect s" diukur dengan tracemalloc aktif sehingga lebih lambat dari crawl biasa.
+    print(f"{'variant':<10}{'products':>10}{'held MB':>10}{'bytes/product':>15}{'collect s':>11}{'to_frame s':>12}")
+    for variant, r in run(args.pages, args.parser).items():
+        print(f"{variant:<10}{r['products']:>10}{r['held_bytes'] / 2**20:>10.1f}"
+              f"{r['held_bytes'] / r['products']:>15.0f}{r['collect_seconds']:>11.2f}{r['frame_seconds']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
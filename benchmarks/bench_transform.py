@@ -0,0 +1,109 @@
+"""Benchmark clean_frame: implementasi lama (banyak lintasan) vs satu lintasan.
+
+Setiap varian dijalankan di proses terpisah agar peak RSS-nya terukur bersih.
+Jalankan dari root proyek::
+
+    python -m benchmarks.bench_transform --rows 10000000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.fixtures import generate_scraped_frame
+
+
+def legacy_clean_frame(df):
+    """Salinan clean_data sebelum optimasi satu lintasan, sebagai pembanding."""
+    df = df.dropna()
+    df = df.drop_duplicates()
+    df = df[df["Title"] != "Unknown Product"]
+    df = df[~df["Price"].astype(str).str.contains("Unknown", na=False)]
+    df["Price"] = df["Price"].replace(r'[\$,]', '', regex=True).astype(float) * 16000
+    df = df[~df["Rating"].astype(str).str.contains("Invalid", na=False)]
+    df["Rating"] = df["Rating"].astype(str).str.extract(r"([\d.]+)").astype(float)
+    df["Colors"] = df["Colors"].astype(str).str.extract(r"(\d+)").astype(int)
+    df["Size"] = df["Size"].astype(str).str.replace("Size: ", "", regex=False)
+    df["Gender"] = df["Gender"].astype(str).str.replace("Gender: ", "", regex=False)
+    return df
+
+
+def _measure(variant, path, trace_alloc=False):
+    pd.options.mode.chained_assignment = None
+    if variant == "legacy":
+        clean = legacy_clean_frame
+    else:
+        from utils.transform import clean_frame as clean
+    df = pd.read_pickle(path)
+    loaded_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = clean(df)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    traced_mb = None
+    if trace_alloc:
+        # Lintasan kedua dengan tracemalloc: peak alokasi khusus tahap clean.
+        del result
+        tracemalloc.start()
+        result = clean(df)
+        traced_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss_mb": peak_kb / 1024,
+        "clean_peak_mb": (peak_kb - loaded_kb) / 1024,
+        "traced_peak_mb": traced_mb,
+        "rows_out": len(result),
+    }))
+
+
+def run(rows, seed=0, variants=("legacy", "single-pass"), trace_alloc=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        # Frame disimpan sebagai pickle (hasil read_csv) agar peak RSS saat
+        # membaca tidak menutupi peak RSS tahap clean.
+        path = os.path.join(tmp, "scraped.pkl")
+        csv_path = os.path.join(tmp, "scraped.csv")
+        generate_scraped_frame(rows, seed=seed).to_csv(csv_path, index=False)
+        pd.read_csv(csv_path).to_pickle(path)
+        results = {}
+        for variant in variants:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_transform", "--measure", variant, path]
+                + (["--trace-alloc"] if trace_alloc else []),
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results[variant] = json.loads(output.strip().splitlines()[-1])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-alloc", action="store_true",
+                        help="Ukur juga peak alokasi tahap clean dengan tracemalloc (lintasan kedua)")
+    parser.add_argument("--measure", nargs=2, metavar=("VARIANT", "PICKLE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        _measure(*args.measure, trace_alloc=args.trace_alloc)
+        return
+
+    results = run(args.rows, args.seed, trace_alloc=args.trace_alloc)
+    # "+clean MB" = kenaikan peak RSS di atas frame yang sudah dibaca.
+    print(f"{'variant':<14}{'seconds':>10}{'peak RSS MB':>14}{'+clean MB':>12}{'traced MB':>12}{'rows out':>12}")
+    for variant, r in results.items():
+        traced = f"{r['traced_peak_mb']:.0f}" if r["traced_peak_mb"] is not None else "-"
+        print(f"{variant:<14}{r['seconds']:>10.2f}{r['peak_rss_mb']:>14.0f}{r['clean_peak_mb']:>12.0f}"
+              f"{traced:>12}{r['rows_out']:>12}")
+
+
+if __name__ == "__main__":
+    main()
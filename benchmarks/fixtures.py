@@ -0,0 +1,215 @@
+"""Halaman katalog sintetis dan server HTTP lokal untuk benchmark.
+
+Struktur HTML meniru https://fashion-studio.dicoding.dev/ (card
+``collection-card``, detail ``div.product-details p`` dan pagination
+``li.page-item``) termasuk baris kotornya: "Unknown Product" dengan rating
+invalid dan produk "Price Unavailable".
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CARDS_PER_PAGE = 20
+PAGINATION_WINDOW = 5
+CATEGORIES = ["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket"]
+SIZES = ["S", "M", "L", "XL", "XXL"]
+GENDERS = ["Men", "Women", "Unisex"]
+
+_DETAIL = '<p style="font-size: 14px; color: #777;">{}</p>'
+
+
+def render_card(product_no, rng):
+    """Render satu ``collection-card`` dengan pola data kotor situs aslinya."""
+    if product_no % 10 == 1:
+        title, price = "Unknown Product", '<span class="price">$100.00</span>'
+        details = ["Rating: ⭐ Invalid Rating / 5", "5 Colors", "Size: M", "Gender: Men"]
+    elif product_no % 30 == 16:
+        title = f"Pants {product_no}"
+        price = ""
+        details = ['<p class="price">Price Unavailable</p>', "Rating: Not Rated", "8 Colors", "Size: S"]
+    else:
+        title = f"{CATEGORIES[product_no % len(CATEGORIES)]} {product_no}"
+        price = f'<span class="price">${rng.uniform(10, 500):.2f}</span>'
+        details = [
+            f"Rating: ⭐ {rng.uniform(3, 5):.1f} / 5",
+            f"{rng.randint(1, 8)} Colors",
+            f"Size: {rng.choice(SIZES)}",
+            f"Gender: {rng.choice(GENDERS)}",
+        ]
+    rendered = "".join(d if d.startswith("<p") else _DETAIL.format(d) for d in details)
+    return (
+        '<div class="collection-card">'
+        '<div style="position: relative;"><img class="collection-image" src="/img.jpg"></div>'
+        '<div class="product-details">'
+        f'<h3 class="product-title">{title}</h3>'
+        f'<div class="price-container">{price}</div>'
+        f"{rendered}"
+        "</div></div>"
+    )
+
+
+def render_page(page_no, total_pages, cards_per_page=CARDS_PER_PAGE, seed=0):
+    """Render satu halaman katalog lengkap dengan pagination."""
+    rng = random.Random(seed * 100003 + page_no)
+    first = (page_no - 1) * cards_per_page + 1
+    cards = "".join(render_card(n, rng) for n in range(first, first + cards_per_page))
+
+    # Pagination hanya menampilkan halaman pertama, terakhir dan sekitar
+    # halaman aktif, agar ukuran halaman tidak ikut membesar dengan katalog.
+    items = []
+    for n in sorted({1, total_pages, *range(max(1, page_no - PAGINATION_WINDOW),
+                                             min(total_pages, page_no + PAGINATION_WINDOW) + 1)}):
+        href = "/" if n == 1 else f"/page{n}"
+        if n == page_no:
+            items.append(f'<li class="page-item current"><span class="page-link">{n}</span></li>')
+        else:
+            items.append(f'<li class="page-item"><a class="page-link" href="{href}">{n}</a></li>')
+    if page_no < total_pages:
+        items.append(f'<li class="page-item next"><a class="page-link" href="/page{page_no + 1}">Next</a></li>')
+
+    return (
+        "<html><body><div id=\"collectionList\" class=\"collection-grid\">"
+        f"{cards}</div>"
+        f'<ul class="pagination">{"".join(items)}</ul>'
+        "</body></html>"
+    )
+
+
+def render_pages(total_pages, cards_per_page=CARDS_PER_PAGE, seed=0):
+    """Render seluruh katalog sebagai dict ``path -> bytes``."""
+    pages = {}
+    for n in range(1, total_pages + 1):
+        path = "/" if n == 1 else f"/page{n}"
+        pages[path] = render_page(n, total_pages, cards_per_page, seed).encode("utf-8")
+    return pages
+
+
+@contextmanager
+def serve_pages(pages, latency=0.0):
+    """Jalankan server HTTP lokal yang menyajikan ``pages``; yield base URL-nya.
+
+    ``latency`` (detik) ditambahkan ke setiap respons untuk meniru jarak
+    jaringan ke situs aslinya.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            body = pages.get(self.path)
+            if latency:
+                time.sleep(latency)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# Baris kotor persis seperti di scraped_fashion_products.csv.
+UNKNOWN_PRODUCT_ROW = ("Unknown Product", "$100.00", "Rating: ⭐ Invalid Rating / 5", "5 Colors", "Size: M", "Gender: Men")
+PRICE_UNAVAILABLE_ROW = ("Unknown Price", "Price Unavailable", "Rating: Not Rated", "8 Colors", "Size: S")
+
+
+def generate_scraped_frame(rows, seed=0, unknown_ratio=0.10, unavailable_ratio=1 / 30, duplicate_ratio=0.01):
+    """DataFrame mentah sintetis dengan rasio data kotor seperti hasil scraping asli.
+
+    Default rasio diambil dari ``scraped_fashion_products.csv``: 10% "Unknown
+    Product" (rating invalid), ~3.3% "Price Unavailable" (kolom bergeser) dan
+    ~1% baris duplikat.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    numbers = np.arange(1, rows + 1)
+    kind = rng.random(rows)
+    unknown = kind < unknown_ratio
+    unavailable = (kind >= unknown_ratio) & (kind < unknown_ratio + unavailable_ratio)
+
+    categories = np.array(CATEGORIES, dtype=object)[numbers % len(CATEGORIES)]
+    titles = categories + " " + numbers.astype(str).astype(object)
+    prices = pd.Series(rng.uniform(10, 500, rows)).map("${:.2f}".format).to_numpy(dtype=object)
+    ratings = pd.Series(np.round(rng.uniform(3, 5, rows), 1)).map("Rating: ⭐ {} / 5".format).to_numpy(dtype=object)
+    colors = pd.Series(rng.integers(1, 9, rows)).map("{} Colors".format).to_numpy(dtype=object)
+    sizes = np.array([f"Size: {s}" for s in SIZES], dtype=object)[rng.integers(0, len(SIZES), rows)]
+    genders = np.array([f"Gender: {g}" for g in GENDERS], dtype=object)[rng.integers(0, len(GENDERS), rows)]
+    # Satu timestamp per halaman (20 produk), seperti crawl aslinya.
+    timestamps = (pd.Timestamp("2025-05-21T14:25:48") + pd.to_timedelta((numbers - 1) // CARDS_PER_PAGE, unit="s"))
+    timestamps = timestamps.strftime("%Y-%m-%dT%H:%M:%S.%f").to_numpy(dtype=object)
+
+    frame = pd.DataFrame({
+        "Title": titles, "Price": prices, "Rating": ratings, "Colors": colors,
+        "Size": sizes, "Gender": genders, "Timestamp": timestamps,
+    })
+    for column, value in zip(frame.columns, UNKNOWN_PRODUCT_ROW):
+        frame.loc[unknown, column] = value
+    frame.loc[unavailable, "Title"] = "Pants " + numbers[unavailable].astype(str).astype(object)
+    for column, value in zip(frame.columns[1:], PRICE_UNAVAILABLE_ROW):
+        frame.loc[unavailable, column] = value
+
+    duplicates = rng.random(rows) < duplicate_ratio
+    duplicates[0] = False
+    source = np.flatnonzero(duplicates) - 1
+    frame.iloc[np.flatnonzero(duplicates)] = frame.iloc[source].to_numpy()
+    return frame
+
+
+class FakeSheetsService:
+    """Pengganti lokal client Google Sheets (``spreadsheets().values()``).
+
+    Tidak menyimpan isi sheet; hanya menghitung request dan sel yang dikirim
+    agar biaya serialisasi dan diff ``sync_to_gsheet`` bisa diukur tanpa
+    jaringan.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.cells = 0
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _request(self, cells=0):
+        fake = self
+
+        class Request:
+            def execute(self):
+                fake.requests += 1
+                fake.cells += cells
+                return {}
+        return Request()
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        return self._request(sum(len(row) for row in body["values"]))
+
+    def clear(self, spreadsheetId, range, body):
+        return self._request()
+
+    def batchClear(self, spreadsheetId, body):
+        return self._request()
+
+    def batchUpdate(self, spreadsheetId, body):
+        return self._request(sum(len(row) for entry in body["data"] for row in entry["values"]))
@@ -0,0 +1,192 @@
+"""Benchmark suite ETL lengkap per tier ukuran, hasil disimpan sebagai JSON.
+
+Mengukur ``extract_product_data``, setiap engine parser,
+``scrape_fashion_products`` terhadap server HTTP lokal, ``clean_data`` dan
+setiap loader terhadap pengganti lokal (CSV, Parquet, SQLite untuk to_sql,
+serialisasi COPY, Google Sheets palsu). Semua data sintetis dan ber-seed
+sehingga hasil antar commit bisa dibandingkan. Jalankan dari root proyek::
+
+    python -m benchmarks.suite --tier 100k --repeat 3 --output bench-100k.json
+    python -m benchmarks.suite --tier 100k --repeat 3 --compare bench-100k.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from benchmarks.bench_load import bench_copy_serialization, bench_sqlite_to_sql
+from benchmarks.fixtures import (
+    CARDS_PER_PAGE, FakeSheetsService, generate_scraped_frame, render_pages, serve_pages,
+)
+from utils.columnar import pa
+from utils.extract import scrape_fashion_products
+from utils.load import CsvSink, ParquetSink, sync_to_gsheet
+from utils.parsers import PARSER_ENGINES, extract_product_data, get_parser
+from utils.transform import clean_data
+
+# ``rows`` = ukuran data untuk transform. Crawl, parsing dan loader yang
+# lambat per baris dibatasi agar tier 10m tetap selesai dalam hitungan menit;
+# hasilnya dibandingkan lewat throughput (per_second), bukan total detik.
+TIERS = {
+    "1k": {"rows": 1_000, "crawl_pages": 50, "parse_pages": 50, "load_rows": 1_000, "chunksize": None},
+    "100k": {"rows": 100_000, "crawl_pages": 500, "parse_pages": 500, "load_rows": 100_000, "chunksize": None},
+    "10m": {"rows": 10_000_000, "crawl_pages": 2_000, "parse_pages": 1_000, "load_rows": 1_000_000,
+            "chunksize": 1_000_000},
+}
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def _result(seconds, items, unit):
+    return {"seconds": round(seconds, 6), "items": items, "unit": unit,
+            "per_second": round(items / seconds, 1) if seconds else None}
+
+
+def bench_extract_product_data(catalog):
+    cards = [card for content in catalog for card in
+             BeautifulSoup(content, "html.parser").find_all("div", class_="collection-card")]
+    seconds, products = _timed(lambda: [extract_product_data(card) for card in cards])
+    return _result(seconds, len(products), "cards")
+
+
+def bench_parsers(catalog):
+    results = {}
+    for engine in sorted(PARSER_ENGINES):
+        try:
+            parse = get_parser(engine)
+            seconds, cards = _timed(lambda: sum(len(parse(content)[0]) for content in catalog))
+        except RuntimeError:
+            continue  # engine opsional yang paketnya tidak terpasang
+        results[f"parse[{engine}]"] = _result(seconds, cards, "cards")
+    return results
+
+
+def bench_scrape(pages, workers=(1, 8)):
+    results = {}
+    with serve_pages(render_pages(pages)) as base_url:
+        for count in workers:
+            seconds, products = _timed(scrape_fashion_products, base_url, delay=0, workers=count)
+            results[f"scrape[workers={count}]"] = _result(seconds, len(products), "products")
+    return results
+
+
+def bench_clean_data(tmp, rows, chunksize):
+    raw_path = os.path.join(tmp, "scraped.csv")
+    clean_path = os.path.join(tmp, "cleaned.csv")
+    generate_scraped_frame(rows).to_csv(raw_path, index=False)
+    seconds, _ = _timed(clean_data, raw_path, clean_path, chunksize=chunksize)
+    return _result(seconds, rows, "rows"), clean_path
+
+
+def bench_loaders(tmp, clean_path, rows):
+    df = pd.read_csv(clean_path, nrows=rows)
+    results = {}
+
+    def write_sink(sink):
+        sink.write(df)
+        sink.close()
+
+    results["load[csv]"] = _result(_timed(write_sink, CsvSink(os.path.join(tmp, "load.csv")))[0], len(df), "rows")
+    if pa is not None:
+        parquet = ParquetSink(os.path.join(tmp, "load.parquet"))
+        results["load[parquet]"] = _result(_timed(write_sink, parquet)[0], len(df), "rows")
+    results["load[sqlite to_sql]"] = _result(bench_sqlite_to_sql(df), len(df), "rows")
+    results["load[copy serialize]"] = _result(bench_copy_serialization(df), len(df), "rows")
+
+    snapshot = os.path.join(tmp, "gsheet.json")
+    sheets = FakeSheetsService()
+    seconds, _ = _timed(sync_to_gsheet, df, "bench", snapshot_path=snapshot, service=sheets)
+    results["load[gsheet full]"] = _result(seconds, len(df), "rows")
+    # Push kedua dengan ~1% baris berubah: jalur diff yang dipakai harian.
+    changed = df.copy()
+    changed.loc[changed.index[::100], "Price"] += 1
+    seconds, _ = _timed(sync_to_gsheet, changed, "bench", snapshot_path=snapshot, service=sheets)
+    results["load[gsheet diff 1%]"] = _result(seconds, len(df), "rows")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(tier):
+    config = TIERS[tier]
+    catalog = list(render_pages(config["parse_pages"]).values())
+    results = {"extract_product_data": bench_extract_product_data(catalog)}
+    results.update(bench_parsers(catalog))
+    results.update(bench_scrape(config["crawl_pages"]))
+    with tempfile.TemporaryDirectory() as tmp:
+        results["clean_data"], clean_path = bench_clean_data(tmp, config["rows"], config["chunksize"])
+        results.update(bench_loaders(tmp, clean_path, config["load_rows"]))
+    return {
+        "tier": tier,
+        "config": config,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "cards_per_page": CARDS_PER_PAGE,
+        "results": results,
+    }
+
+
+def best_of(reports):
+    """Gabungkan beberapa run: per benchmark ambil yang tercepat (mengurangi noise)."""
+    best = reports[0]
+    for report in reports[1:]:
+        for name, r in report["results"].items():
+            if r["seconds"] < best["results"][name]["seconds"]:
+                best["results"][name] = r
+    best["repeat"] = len(reports)
+    return best
+
+
+def print_report(report, baseline=None):
+    base = (baseline or {}).get("results", {})
+    print(f"tier {report['tier']} @ {report['commit'] or '-'}")
+    print(f"{'benchmark':<24}{'items':>10}{'seconds':>10}{'per second':>14}{'vs base':>10}")
+    for name, r in report["results"].items():
+        ratio = ""
+        if name in base and base[name]["per_second"] and r["per_second"]:
+            ratio = f"{r['per_second'] / base[name]['per_second']:.2f}x"
+        print(f"{name:<24}{r['items']:>10}{r['seconds']:>10.3f}{r['per_second'] or 0:>14.0f}{ratio:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tier", choices=sorted(TIERS), default="1k")
+    parser.add_argument("--repeat", type=int, default=1, help="Ulangi suite dan ambil hasil tercepat")
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    parser.add_argument("--compare", help="JSON hasil sebelumnya sebagai pembanding (rasio throughput)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    report = best_of([run(args.tier) for _ in range(max(1, args.repeat))])
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Hasil disimpan di '{args.output}'", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Helper bersama untuk test: halaman katalog tiruan dan response HTTP tiruan."""
+from unittest.mock import Mock
+
+import requests
+
+
+def catalog_page(number, total, cards=2):
+    """HTML halaman katalog ke-``number`` dari ``total`` halaman, berisi ``cards`` produk ``P<number>-<i>``.
+
+    Price dan detail setiap produk berbeda agar tertukarnya field terdeteksi.
+    """
+    items = "".join(
+        f'<li class="page-item"><a href="/page{n}">{n}</a></li>' for n in range(2, total + 1) if n != number
+    )
+    next_item = f'<li class="page-item next"><a href="/page{number + 1}">Next</a></li>' if number < total else ""
+    body = "".join(
+        f'<div class="collection-card"><h3 class="product-title">P{number}-{i}</h3>'
+        f'<span class="price">${number}{i}.50</span><div class="product-details">'
+        f'<p>Rating: {i + 1}.{number} / 5</p><p>{number + i} Colors</p><p>Size: {"SML"[i % 3]}</p>'
+        f'<p>Gender: {("Men", "Women")[number % 2]}</p></div></div>'
+        for i in range(cards)
+    )
+    return f"<html>{body}<ul>{items}{next_item}</ul></html>".encode()
+
+
+def catalog(total=5, cards=2):
+    """``{url: html}`` untuk seluruh katalog di ``http://shop/``."""
+    pages = {"http://shop/": catalog_page(1, total, cards)}
+    pages.update({f"http://shop/page{n}": catalog_page(n, total, cards) for n in range(2, total + 1)})
+    return pages
+
+
+def response(status, content=b"", headers=None):
+    """Response ``requests`` tiruan; status >= 400 membuat ``raise_for_status`` gagal."""
+    mock = Mock()
+    mock.status_code = status
+    mock.content = content
+    mock.headers = headers or {}
+    if status >= 400:
+        mock.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status} Error")
+    else:
+        mock.raise_for_status.return_value = None
+    return mock
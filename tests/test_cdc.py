@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.cdc import SnapshotIndex, capture_changes, price_history
+
+
+@pytest.fixture
+def catalogue():
+    """Snapshot bersih contoh: empat produk"""
+    return pd.DataFrame({
+        "Title": ["Hoodie 1", "Hoodie 2", "Pants 3", "Jacket 4"],
+        "Price": [100.0, 200.0, 300.0, 400.0],
+        "Rating": [4.5, 4.0, 3.5, 5.0],
+        "Colors": [3, 3, 2, 1],
+        "Size": ["L", "M", "L", "XL"],
+        "Gender": ["Men", "Women", "Unisex", "Men"],
+        "Timestamp": ["2025-05-21T10:00:00"] * 4,
+    })
+
+
+def test_capture_changes_emits_inserts_updates_deletes(tmpdir, catalogue):
+    """Test CDC mendeteksi produk baru, harga berubah dan produk hilang; Timestamp diabaikan"""
+    path = str(tmpdir.join("changes.sqlite"))
+    first = capture_changes(catalogue, path)
+    assert first.counts() == {"insert": 4, "update": 0, "delete": 0}
+    assert len(capture_changes(catalogue.assign(Timestamp="2025-05-22T10:00:00"), path)) == 0
+
+    snapshot = catalogue.drop(index=2).assign(Timestamp="2025-05-23T10:00:00")
+    snapshot.loc[1, "Price"] = 250.0
+    snapshot.loc[4] = ["Shirt 5", 50.0, 4.1, 1, "S", "Women", "2025-05-23T10:00:00"]
+    changes = capture_changes(snapshot, path, captured_at="2025-05-23T10:00:00")
+
+    assert changes.counts() == {"insert": 1, "update": 1, "delete": 1}
+    assert changes.inserts["Title"].tolist() == ["Shirt 5"]
+    assert changes.updates[["Title", "Price", "Price_old"]].values.tolist() == [["Hoodie 2", 250.0, 200.0]]
+    assert changes.deletes["Title"].tolist() == ["Pants 3"]
+    assert changes.rows()["Title"].tolist() == ["Hoodie 2", "Shirt 5"]
+
+    history = price_history(path, title="Hoodie 2")
+    assert history[["change", "Price"]].values.tolist() == [["insert", 200.0], ["update", 250.0]]
+    assert price_history(path, title="Pants 3")["change"].tolist() == ["insert", "delete"]
+
+
+def test_snapshot_index_tracks_changes_across_batches(tmpdir, catalogue):
+    """Test batch berikutnya dibandingkan dengan perubahan batch sebelumnya; tanpa finish tidak tersimpan"""
+    path = str(tmpdir.join("changes.sqlite"))
+    capture_changes(catalogue, path)
+
+    index = SnapshotIndex(path)
+    first = index.capture(catalogue.iloc[:2].assign(Price=[150.0, 200.0]))
+    again = index.capture(catalogue.iloc[:1].assign(Price=150.0))
+    index.close()
+    assert first.counts()["update"] == 1 and len(again) == 0
+
+    index = SnapshotIndex(path)
+    assert len(index.capture(catalogue.iloc[:2].assign(Price=[150.0, 200.0]))) == 1
+    assert sorted(index.finish().deletes["Title"]) == ["Jacket 4", "Pants 3"]
+    index.close()
+    assert len(SnapshotIndex(path)) == 2
+
+
+def test_finish_without_rows_keeps_catalogue(tmpdir, catalogue):
+    """Test snapshot kosong tidak menghapus seluruh katalog"""
+    path = str(tmpdir.join("changes.sqlite"))
+    capture_changes(catalogue, path)
+    assert len(capture_changes(catalogue.iloc[:0], path)) == 0
+    assert len(SnapshotIndex(path)) == 4
+
+
+def test_finish_without_changes_keeps_snapshot_index(tmpdir, catalogue):
+    """Run tanpa perubahan tidak menulis ulang blob snapshot_index"""
+    path = str(tmpdir.join("changes.sqlite"))
+    capture_changes(catalogue, path)
+
+    index = SnapshotIndex(path)
+    statements = []
+    index._con.set_trace_callback(statements.append)
+    index.capture(catalogue.assign(Timestamp="2025-05-22T10:00:00"))
+    index.finish()
+    index.close()
+
+    assert not any("snapshot_index" in statement for statement in statements)
+    assert len(SnapshotIndex(path)) == len(catalogue)
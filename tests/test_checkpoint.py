@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.checkpoint import CrawlCheckpoint
+from utils.extract import Page, scrape_fashion_products
+from tests.helpers import catalog
+
+
+EXPECTED_TITLES = [f"P{n}-{i}" for n in range(1, 6) for i in range(2)]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+@patch("utils.extract.time.sleep")
+@patch("utils.extract.fetching_content")
+def test_crawl_resumes_after_failed_page(mock_fetch, mock_sleep, tmpdir, workers):
+    """Test crawl yang gagal di tengah dilanjutkan dari halaman terakhir yang berhasil"""
+    path = str(tmpdir.join("crawl.jsonl"))
+    pages = catalog()
+    fetched = []
+
+    def flaky(url, fetcher=None):
+        fetched.append(url)
+        return None if url == "http://shop/page4" else pages[url]
+
+    mock_fetch.side_effect = flaky
+    with CrawlCheckpoint(path, "http://shop/") as checkpoint:
+        partial = scrape_fashion_products("http://shop/", delay=0, workers=workers, checkpoint=checkpoint)
+        assert not checkpoint.finished
+    assert [p["Title"] for p in partial] == EXPECTED_TITLES[:6]
+
+    fetched.clear()
+    mock_fetch.side_effect = lambda url, fetcher=None: fetched.append(url) or pages[url]
+    with CrawlCheckpoint(path, "http://shop/", resume=True) as checkpoint:
+        result = scrape_fashion_products("http://shop/", delay=0, workers=workers, checkpoint=checkpoint)
+        assert checkpoint.finished
+
+    assert [p["Title"] for p in result] == EXPECTED_TITLES
+    assert sorted(fetched) == ["http://shop/page4", "http://shop/page5"]
+    assert result[0]["Timestamp"] == partial[0]["Timestamp"]
+
+
+def test_checkpoint_ignores_truncated_last_line(tmpdir):
+    """Test baris terakhir yang terpotong dibuang saat checkpoint dibuka ulang"""
+    path = str(tmpdir.join("crawl.jsonl"))
+    product = {"Title": "A", "Price": "$1.00", "Rating": "Rating: ⭐ 4.0 / 5", "Colors": "3 Colors",
+               "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2025-01-01T00:00:00"}
+    with CrawlCheckpoint(path, "http://shop/") as checkpoint:
+        checkpoint.append(Page("http://shop/", [product], "/page2", ["/page2"]))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"url":"http://shop/page2","products":[["B"')
+
+    with CrawlCheckpoint(path, "http://shop/") as checkpoint:
+        assert [page["url"] for page in checkpoint.pages()] == ["http://shop/"]
+        assert checkpoint.pages()[0]["products"] == [product]
+        checkpoint.append(Page("http://shop/page2", [], None, []))
+
+    with CrawlCheckpoint(path, "http://shop/") as checkpoint:
+        assert [page["url"] for page in checkpoint.pages()] == ["http://shop/", "http://shop/page2"]
+        assert checkpoint.finished
+
+
+def test_checkpoint_rejects_other_crawl(tmpdir):
+    """Test checkpoint milik base URL lain tidak dipakai untuk resume"""
+    path = str(tmpdir.join("crawl.jsonl"))
+    CrawlCheckpoint(path, "http://shop/").close()
+    with pytest.raises(ValueError, match="bukan"):
+        CrawlCheckpoint(path, "http://other/")
+    CrawlCheckpoint(path, "http://other/", resume=False).close()
@@ -0,0 +1,133 @@
+import pytest
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+pytest.importorskip("pyarrow")
+
+from utils.columnar import clean_schema, is_columnar, raw_schema, read_columnar, write_columnar
+from utils.load import load_from_columnar, load_from_csv
+from utils.transform import clean_data
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def raw_data():
+    return pd.read_csv(ROOT / "scraped_fashion_products.csv").head(200)
+
+
+def test_is_columnar():
+    assert is_columnar("data.parquet")
+    assert is_columnar("data.ARROW")
+    assert not is_columnar("data.csv")
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".arrow"])
+def test_raw_roundtrip_is_typed(tmpdir, raw_data, extension):
+    path = str(tmpdir.join("raw" + extension))
+    write_columnar(raw_data, path, raw_schema())
+    df = read_columnar(path)
+
+    assert df["Size"].dtype == "category"
+    assert pd.api.types.is_datetime64_any_dtype(df["Timestamp"])
+    assert df["Title"].astype(str).tolist() == raw_data["Title"].tolist()
+
+
+@pytest.mark.parametrize("chunksize", [None, 64])
+def test_clean_data_columnar_matches_csv(tmpdir, raw_data, chunksize):
+    raw_csv = str(tmpdir.join("raw.csv"))
+    raw_parquet = str(tmpdir.join("raw.parquet"))
+    raw_data.to_csv(raw_csv, index=False)
+    write_columnar(raw_data, raw_parquet, raw_schema())
+
+    clean_csv = str(tmpdir.join("clean.csv"))
+    clean_parquet = str(tmpdir.join("clean.parquet"))
+    clean_data(raw_csv, clean_csv)
+    clean_data(raw_parquet, clean_parquet, chunksize=chunksize)
+
+    expected = pd.read_csv(clean_csv)
+    result = load_from_columnar(clean_parquet)
+    assert list(result.dtypes.astype(str)) == [
+        "category", "float64", "float64", "uint8", "category", "category", "datetime64[us]"
+    ]
+    assert result["Title"].astype(str).tolist() == expected["Title"].tolist()
+    assert result["Price"].tolist() == pytest.approx(expected["Price"].tolist())
+    assert result["Rating"].astype(float).round(2).tolist() == expected["Rating"].tolist()
+    assert result["Colors"].astype(int).tolist() == expected["Colors"].tolist()
+    assert (result["Timestamp"] == pd.to_datetime(expected["Timestamp"])).all()
+
+
+def test_clean_schema_rejects_overflow(tmpdir):
+    df = pd.DataFrame({
+        "Title": ["A"], "Price": [1.0], "Rating": [4.5], "Colors": [300],
+        "Size": ["M"], "Gender": ["Men"], "Timestamp": ["2025-05-21T14:25:48"],
+    })
+    with pytest.raises(Exception):
+        write_columnar(df, str(tmpdir.join("bad.parquet")), clean_schema())
+
+
+@pytest.mark.parametrize("options", [{"chunksize": 64}, {"workers": 2}])
+def test_clean_data_writes_arrow_incrementally(tmpdir, raw_data, options):
+    raw_csv = str(tmpdir.join("raw.csv"))
+    raw_data.to_csv(raw_csv, index=False)
+    clean_csv = str(tmpdir.join("clean.csv"))
+    clean_arrow = str(tmpdir.join("clean.arrow"))
+    clean_data(raw_csv, clean_csv)
+    clean_data(raw_csv, clean_arrow, **options)
+
+    expected = pd.read_csv(clean_csv)
+    result = load_from_columnar(clean_arrow)
+    assert result["Title"].tolist() == expected["Title"].tolist()
+    assert result["Size"].tolist() == expected["Size"].tolist()
+    assert result["Price"].tolist() == pytest.approx(expected["Price"].tolist())
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".arrow"])
+def test_columnar_input_treats_na_fallbacks_as_missing(tmpdir, raw_data, extension):
+    # Fallback "N/A" dari scraper tetap berupa teks di file kolumnar.
+    raw_data = raw_data.fillna("N/A")
+    raw_data.loc[5, ["Rating", "Colors", "Size", "Gender"]] = "N/A"
+    raw_csv = str(tmpdir.join("raw.csv"))
+    raw_columnar = str(tmpdir.join("raw" + extension))
+    raw_data.to_csv(raw_csv, index=False)
+    write_columnar(raw_data, raw_columnar, raw_schema())
+
+    clean_csv = str(tmpdir.join("clean.csv"))
+    clean_data(raw_csv, clean_csv)
+    expected = pd.read_csv(clean_csv)
+    for options in ({}, {"chunksize": 64}, {"workers": 2}):
+        clean_columnar = str(tmpdir.join("clean-columnar.csv"))
+        clean_data(raw_columnar, clean_columnar, **options)
+        assert pd.read_csv(clean_columnar)["Title"].tolist() == expected["Title"].tolist()
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".arrow"])
+def test_columnar_clean_data_gives_same_sink_rows_and_cdc_hashes(tmpdir, raw_data, extension):
+    """Data bersih dari CSV dan dari file kolumnar menghasilkan baris sink dan hash CDC yang identik."""
+    from utils.cdc import SnapshotIndex, key_hashes, value_hashes
+    from utils.load import _analytics_rows, _sheet_rows
+
+    raw_csv = str(tmpdir.join("raw.csv"))
+    raw_data.to_csv(raw_csv, index=False)
+    clean_csv = str(tmpdir.join("clean.csv"))
+    clean_columnar = str(tmpdir.join("clean" + extension))
+    clean_data(raw_csv, clean_csv)
+    clean_data(raw_csv, clean_columnar)
+    expected, result = load_from_csv(clean_csv), load_from_columnar(clean_columnar)
+
+    assert _sheet_rows(result).values.tolist() == _sheet_rows(expected).values.tolist()
+    assert list(_analytics_rows(result)) == list(_analytics_rows(expected))
+    assert (key_hashes(result) == key_hashes(expected)).all()
+    assert (value_hashes(result) == value_hashes(expected)).all()
+
+    history = []
+    for name, df in [("csv", expected), ("columnar", result)]:
+        index = SnapshotIndex(str(tmpdir.join(name + ".sqlite")))
+        index.capture(df)
+        index.finish()
+        history.append(index._con.execute('SELECT "Price", "Rating", "Timestamp" FROM history ORDER BY id').fetchall())
+        index.close()
+    assert history[0] == history[1]
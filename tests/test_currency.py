@@ -0,0 +1,95 @@
+import pytest
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.currency import CurrencyConverter, FileRateProvider, StaticRateProvider
+from utils.transform import clean_frame
+
+
+class CountingProvider(StaticRateProvider):
+    def __init__(self, rates):
+        super().__init__(rates)
+        self.calls = 0
+        self.fail = False
+
+    def fetch(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("layanan kurs mati")
+        return super().fetch()
+
+
+@pytest.fixture
+def rates_file(tmpdir):
+    path = str(tmpdir.join("rates.csv"))
+    pd.DataFrame({
+        "date": ["2025-01-01", "2025-03-01", "2025-01-01"],
+        "currency": ["USD", "USD", "EUR"],
+        "rate": [15000, 16500, 17000],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_convert_uses_rate_valid_on_each_date(rates_file):
+    """Kurs yang dipakai adalah kurs terakhir pada atau sebelum tanggal baris."""
+    converter = CurrencyConverter(FileRateProvider(rates_file))
+    result = converter.convert(
+        [1, 2, 1, 1, 1],
+        ["USD", "usd", "EUR", "USD", "USD"],
+        ["2025-02-01T10:00:00", "2025-03-05", "2025-05-01", "2024-12-01", None],
+    )
+
+    # Sebelum kurs pertama -> kurs paling awal; tanggal kosong -> kurs terbaru.
+    assert result.tolist() == [15000.0, 33000.0, 17000.0, 15000.0, 16500.0]
+
+
+def test_unknown_currency_raises(rates_file):
+    with pytest.raises(ValueError, match="JPY"):
+        CurrencyConverter(FileRateProvider(rates_file)).convert([1], "JPY")
+
+
+def test_rates_are_cached_in_memory_and_on_disk(tmpdir):
+    cache_path = str(tmpdir.join("rates.json"))
+    provider = CountingProvider({"USD": 15500})
+    converter = CurrencyConverter(provider, cache_path=cache_path, ttl=60)
+    converter.convert([1], "USD")
+    converter.convert([2], "USD")
+    assert provider.calls == 1
+
+    # Proses baru: cache di disk masih berlaku sehingga provider tidak ditanya.
+    fresh = CurrencyConverter(provider, cache_path=cache_path, ttl=60)
+    assert fresh.convert([1], "USD").tolist() == [15500.0]
+    assert provider.calls == 1
+
+
+def test_expired_rates_refresh_and_fall_back_to_stale_cache():
+    provider = CountingProvider({"USD": 15500})
+    converter = CurrencyConverter(provider, ttl=60)
+    converter.convert([1], "USD")
+
+    converter.refresh()
+    converter.convert([1], "USD")
+    assert provider.calls == 2
+
+    converter.refresh()
+    provider.fail = True
+    assert converter.convert([1], "USD").tolist() == [15500.0]
+
+
+def test_clean_frame_converts_price_by_timestamp(rates_file):
+    raw = pd.DataFrame({
+        "Title": ["Product A", "Product B"],
+        "Price": ["$10.00", "$10.00"],
+        "Rating": ["4.5 stars", "3.8 stars"],
+        "Colors": ["2 colors", "3 colors"],
+        "Size": ["Size: M", "Size: XL"],
+        "Gender": ["Gender: Male", "Gender: Unisex"],
+        "Timestamp": ["2025-02-01T10:00:00.000000", "2025-04-01T10:00:00.000000"],
+    })
+
+    cleaned = clean_frame(raw, converter=CurrencyConverter(FileRateProvider(rates_file)))
+
+    assert cleaned["Price"].tolist() == [150000.0, 165000.0]
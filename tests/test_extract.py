@@ -1,5 +1,6 @@
 import pytest
 import requests
+import pandas as pd
 from unittest.mock import patch, Mock
 from bs4 import BeautifulSoup
 from datetime import datetime
@@ -13,8 +14,14 @@ from utils.extract import (
     safe_get_text,
     extract_product_data,
     scrape_fashion_products,
+    scrape_fashion_frame,
+    discover_page_pattern,
+    HostRateLimiter,
+    Page,
     HEADERS
 )
+from utils.fetcher import Fetcher
+from tests.helpers import catalog, response as _response
 
 # Sample test data
 SAMPLE_HTML = """
@@ -30,6 +37,11 @@ SAMPLE_HTML = """
 </div>
 """
 
+@pytest.fixture(autouse=True)
+def fresh_default_fetcher(monkeypatch):
+    """Fetcher bersama dibuat ulang per test agar patch requests.Session berlaku."""
+    monkeypatch.setattr("utils.extract._default_fetcher", None)
+
 # 1. Test fetching_content()
 @patch("utils.extract.requests.Session")
 def test_fetching_content_success(mock_session):
@@ -48,6 +60,41 @@ def test_fetching_content_failure(mock_session):
     result = fetching_content("http://invalid.url")
     assert result is None
 
+@patch("utils.fetcher.time.sleep")
+@patch("utils.extract.requests.Session")
+def test_fetcher_retries_transient_errors(mock_session, mock_sleep):
+    mock_session.return_value.get.side_effect = [
+        _response(503),
+        requests.exceptions.ConnectionError("reset"),
+        _response(429, headers={"Retry-After": "2"}),
+        _response(200, b"<html>ok</html>"),
+    ]
+    fetcher = Fetcher(backoff_factor=0.5)
+
+    assert fetcher.fetch("http://flaky.url") == b"<html>ok</html>"
+    assert [c[0][0] for c in mock_sleep.call_args_list] == [0.5, 1.0, 2.0]
+    assert fetcher.summary() == {
+        "pages": 1, "failed": 0, "bytes": 15, "latency": fetcher.stats[0].latency, "retries": 3
+    }
+
+@patch("utils.fetcher.time.sleep")
+@patch("utils.extract.requests.Session")
+def test_fetcher_gives_up_after_max_retries(mock_session, mock_sleep):
+    mock_session.return_value.get.side_effect = [_response(500), _response(500), _response(404)]
+    fetcher = Fetcher(max_retries=1)
+
+    assert fetcher.fetch("http://down.url") is None
+    assert mock_session.return_value.get.call_count == 2
+    assert fetcher.stats[0].status == 500
+    assert fetcher.stats[0].retries == 1
+
+@patch("utils.extract.requests.Session")
+def test_fetching_content_reuses_shared_session(mock_session):
+    mock_session.return_value.get.return_value = _response(200, b"x")
+    fetching_content("http://a.url")
+    fetching_content("http://b.url")
+    assert mock_session.call_count == 1
+
 # 2. Test safe_get_text()
 def test_safe_get_text_with_element():
     soup = BeautifulSoup("<p>Test Text</p>", "html.parser")
@@ -124,3 +171,110 @@ def test_scrape_fashion_products_multiple_pages(mock_sleep, mock_fetch):
     result = scrape_fashion_products()
     assert len(result) == 2
     assert mock_fetch.call_count == 2
+
+# 5. Test mode konkuren scrape_fashion_products()
+@patch("utils.extract.fetching_content")
+def test_scrape_fashion_products_concurrent_keeps_page_order(mock_fetch):
+    pages = catalog(5)
+    mock_fetch.side_effect = lambda url, fetcher=None: pages.get(url)
+
+    result = scrape_fashion_products("http://shop/", delay=0, workers=4)
+
+    assert [p["Title"] for p in result] == [f"P{n}-{i}" for n in range(1, 6) for i in range(2)]
+    assert mock_fetch.call_count == 5
+
+
+@patch("utils.extract.logger")
+@patch("utils.extract.fetching_content")
+def test_scrape_fashion_products_concurrent_reports_skipped_pages(mock_fetch, mock_logger):
+    """Halaman gagal di mode konkuren dilewati dengan warning per URL dan dicatat di metrik."""
+    from utils.metrics import METRICS
+
+    pages = catalog(5)
+    del pages["http://shop/page3"]
+    mock_fetch.side_effect = lambda url, fetcher=None: pages.get(url)
+    METRICS.reset()
+
+    result = scrape_fashion_products("http://shop/", delay=0, workers=4, rate_limit=1000)
+
+    assert [p["Title"] for p in result] == [f"P{n}-{i}" for n in (1, 2, 4, 5) for i in range(2)]
+    assert METRICS.summary()["crawl.skipped"]["errors"] == 1
+    warnings = [call.args[0] % call.args[1:] for call in mock_logger.warning.call_args_list]
+    assert any("http://shop/page3" in message and "dilewati" in message for message in warnings)
+    assert any("1 halaman gagal dilewati" in message for message in warnings)
+
+
+@patch("utils.extract.logger")
+@patch("utils.extract.fetching_content")
+def test_concurrent_crawl_warns_without_rate_limit(mock_fetch, mock_logger):
+    pages = catalog(2)
+    mock_fetch.side_effect = lambda url, fetcher=None: pages.get(url)
+
+    scrape_fashion_products("http://shop/", delay=0, workers=4)
+    scrape_fashion_products("http://shop/", delay=0, workers=4, rate_limit=1000)
+
+    warnings = [call.args[0] for call in mock_logger.warning.call_args_list]
+    assert sum("tanpa rate_limit" in message for message in warnings) == 1
+
+
+@pytest.mark.parametrize("parser", ["html.parser", "lxml"])
+@patch("utils.extract.fetching_content")
+def test_scrape_fashion_products_process_pool_parsing(mock_fetch, parser):
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+    pages = catalog(6)
+    mock_fetch.side_effect = lambda url, fetcher=None: pages.get(url)
+
+    result = scrape_fashion_products("http://shop/", delay=0, workers=2, parser=parser, parse_workers=2)
+    expected = scrape_fashion_products("http://shop/", delay=0, workers=2, parser=parser)
+
+    assert [p["Title"] for p in result] == [f"P{n}-{i}" for n in range(1, 7) for i in range(2)]
+    fields = ["Title", "Price", "Rating", "Colors", "Size", "Gender"]
+    assert [[p[f] for f in fields] for p in result] == [[p[f] for f in fields] for p in expected]
+    assert [result[3][f] for f in fields] == ["P2-1", "$21.50", "Rating: 2.2 / 5", "3 Colors", "Size: M", "Gender: Men"]
+
+
+@patch("utils.extract.fetching_content")
+def test_scrape_fashion_frame_matches_product_list(mock_fetch):
+    """scrape_fashion_frame menghasilkan DataFrame yang sama dengan list dict produk."""
+    pages = catalog(3)
+    mock_fetch.side_effect = lambda url, fetcher=None: pages.get(url)
+
+    df = scrape_fashion_frame("http://shop/", delay=0, workers=2)
+    expected = pd.DataFrame(scrape_fashion_products("http://shop/", delay=0, workers=2))
+
+    assert df.drop(columns="Timestamp").equals(expected.drop(columns="Timestamp"))
+    assert df["Timestamp"].nunique() == 3
+
+
+@patch("utils.extract.fetching_content")
+def test_scrape_fashion_products_concurrent_probes_unknown_total(mock_fetch):
+    # Pagination hanya menampilkan link "next": jumlah halaman harus dicari.
+    pages = {
+        "http://shop/": b'<div class="collection-card">A</div><li class="page-item next"><a href="/page2">Next</a></li>',
+        "http://shop/page2": b'<div class="collection-card">B</div><li class="page-item next"><a href="/page3">Next</a></li>',
+        "http://shop/page3": b'<div class="collection-card">C</div>',
+    }
+    mock_fetch.side_effect = lambda url, fetcher=None: pages.get(url)
+
+    result = scrape_fashion_products("http://shop/", delay=0, workers=3)
+    assert len(result) == 3
+
+
+def test_discover_page_pattern():
+    page = Page("http://shop/", [], "/page2", ["/", "/page2", "/page3", "/page50"])
+    assert discover_page_pattern(page) == ("/page", "", 50)
+    assert discover_page_pattern(Page("http://shop/", [], "/page2", ["/page2"])) == ("/page", "", None)
+    assert discover_page_pattern(Page("http://shop/", [], None, [])) is None
+
+
+@patch("utils.extract.time.sleep")
+def test_host_rate_limiter_spaces_requests_per_host(mock_sleep):
+    limiter = HostRateLimiter(1.0)
+    limiter.wait("http://a.example/page1")
+    limiter.wait("http://b.example/page1")
+    assert mock_sleep.call_count == 0
+
+    limiter.wait("http://a.example/page2")
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args[0][0] <= 1.0
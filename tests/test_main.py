@@ -0,0 +1,44 @@
+import subprocess
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.__main__ import import_breakdown, main
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_run_dispatches_to_stage_main():
+    """Test 'run <stage>' meneruskan opsi berikutnya ke main() stage tersebut"""
+    with patch("utils.transform.main", return_value=None) as transform_main:
+        assert main(["run", "transform", "--workers", "4", "a.csv"]) == 0
+    transform_main.assert_called_once_with(["--workers", "4", "a.csv"])
+
+    with patch("utils.pipeline.main", return_value=1) as pipeline_main:
+        assert main(["run", "all"]) == 1
+    pipeline_main.assert_called_once_with([])
+
+
+def test_import_breakdown_sums_self_time_per_package():
+    """Test waktu import 'self' dijumlahkan per paket teratas"""
+    lines = [
+        "import time: self [us] | cumulative | imported package",
+        "import time:      1500 |       1500 |     pandas.core",
+        "import time:       500 |       2000 |   pandas",
+        "import time:      3000 |       3000 | sqlalchemy",
+        "log biasa",
+    ]
+    assert import_breakdown(lines) == {"sqlalchemy": 0.003, "pandas": 0.002}
+
+
+def test_load_imports_clients_lazily():
+    """Test utils.load tidak mengimpor SQLAlchemy/Google sebelum sink-nya dipakai"""
+    code = (
+        "import sys, utils.load as load\n"
+        "assert not any(m.startswith(('sqlalchemy', 'google')) for m in sys.modules), 'eager import'\n"
+        "load.create_engine\n"
+        "assert 'sqlalchemy' in sys.modules and 'googleapiclient.discovery' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
@@ -0,0 +1,88 @@
+import json
+import logging
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.metrics import MetricsRecorder, configure_logging, get_logger
+
+
+def test_stage_records_counts_and_timing():
+    """Test stage mencatat waktu, baris dan bytes yang diisi pemanggil"""
+    recorder = MetricsRecorder()
+    with recorder.stage("parse", url="/page2") as record:
+        record.rows_out = 20
+        record.bytes = 1024
+
+    [record] = recorder.records()
+    assert record.stage == "parse" and record.ok
+    assert record.labels == {"url": "/page2"}
+    assert record.wall_seconds >= 0 and record.cpu_seconds >= 0
+    assert record.peak_rss_bytes > 0
+
+
+def test_stage_marks_failures_and_reraises():
+    """Test stage yang gagal tetap dicatat dengan ok=False"""
+    recorder = MetricsRecorder()
+    with pytest.raises(ValueError):
+        with recorder.stage("load.postgres"):
+            raise ValueError("db down")
+    assert recorder.summary()["load.postgres"]["errors"] == 1
+
+
+def test_disabled_recorder_keeps_nothing():
+    """Test recorder yang dimatikan tidak menyimpan record"""
+    recorder = MetricsRecorder(enabled=False)
+    with recorder.stage("fetch") as record:
+        record.bytes = 10
+    assert recorder.records() == []
+
+
+def test_export_jsonl_and_prometheus(tmpdir):
+    """Test export ke JSON lines dan format teks Prometheus"""
+    recorder = MetricsRecorder()
+    for rows in (10, 5):
+        with recorder.stage("transform") as record:
+            record.rows_in = rows
+
+    jsonl = tmpdir.join("metrics.jsonl")
+    recorder.export(str(jsonl))
+    lines = [json.loads(line) for line in jsonl.read().splitlines()]
+    assert [line["rows_in"] for line in lines] == [10, 5]
+
+    prom = tmpdir.join("metrics.prom")
+    recorder.export(str(prom))
+    text = prom.read()
+    assert "# TYPE etl_stage_rows_in_total counter" in text
+    assert 'etl_stage_rows_in_total{stage="transform"} 15' in text
+    assert 'etl_stage_calls_total{stage="transform"} 2' in text
+
+
+def test_recorder_keeps_last_records_and_full_summary():
+    """Test record mentah dibatasi max_records, agregat tetap menghitung semuanya"""
+    recorder = MetricsRecorder(max_records=3)
+    for rows in range(10):
+        with recorder.stage("fetch") as record:
+            record.rows_in = rows
+
+    assert [record.rows_in for record in recorder.records()] == [7, 8, 9]
+    assert recorder.summary()["fetch"]["calls"] == 10
+    assert recorder.summary()["fetch"]["rows_in"] == sum(range(10))
+    recorder.reset()
+    assert recorder.records() == [] and recorder.summary() == {}
+
+
+def test_configure_logging_sets_level_for_all_modules():
+    """Test level logger etl berlaku untuk semua logger modul"""
+    configure_logging("WARNING")
+    try:
+        assert not get_logger("extract").isEnabledFor(logging.INFO)
+        assert get_logger("load").isEnabledFor(logging.WARNING)
+    finally:
+        logger = logging.getLogger("etl")
+        logger.handlers.clear()
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
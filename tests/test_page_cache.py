@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import patch, Mock
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.page_cache import PageCache, conditional_headers, content_hash
+from utils.extract import load_page
+from tests.helpers import response as _response
+
+PAGE_HTML = b"""
+<div class="collection-card"><h3 class="product-title">Hoodie 3</h3><span class="price">$10.00</span></div>
+<li class="page-item next"><a href="/page2">Next</a></li>
+"""
+
+
+@pytest.fixture
+def cache(tmpdir):
+    with PageCache(str(tmpdir.join("pages.sqlite"))) as page_cache:
+        yield page_cache
+
+
+def test_put_and_get_roundtrip(cache):
+    page = {"products": [{"Title": "A"}], "next_href": "/page2", "page_hrefs": ["/page2"]}
+    cache.put("http://shop/", '"v1"', "Wed, 21 May 2025 07:00:00 GMT", "abc", page)
+
+    entry = cache.get("http://shop/")
+    assert entry.page == page
+    assert entry.content_hash == "abc"
+    assert conditional_headers(entry) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 21 May 2025 07:00:00 GMT",
+    }
+    assert cache.get("http://shop/missing") is None
+    assert conditional_headers(None) == {}
+
+
+def test_lru_eviction_keeps_recently_used(tmpdir):
+    page = {"products": [], "next_href": None, "page_hrefs": []}
+    size = len('{"products":[],"next_href":null,"page_hrefs":[]}')
+    with PageCache(str(tmpdir.join("small.sqlite")), max_bytes=size * 2) as small:
+        small.put("a", None, None, "1", page)
+        small.put("b", None, None, "2", page)
+        small.get("a")
+        small.put("c", None, None, "3", page)
+
+        assert len(small) == 2
+        assert small.get("b") is None
+        assert small.get("a") is not None
+
+
+def test_load_page_reuses_parsed_products_on_304(cache):
+    fetcher = Mock()
+    fetcher.request.return_value = _response(200, PAGE_HTML, {"ETag": '"v1"'})
+    first = load_page("http://shop/", fetcher, cache)
+    assert [p["Title"] for p in first.products] == ["Hoodie 3"]
+
+    fetcher.request.return_value = _response(304)
+    with patch("utils.extract.parse_page") as mock_parse:
+        second = load_page("http://shop/", fetcher, cache)
+
+    mock_parse.assert_not_called()
+    assert fetcher.request.call_args[1]["headers"] == {"If-None-Match": '"v1"'}
+    assert [p["Title"] for p in second.products] == ["Hoodie 3"]
+    assert second.next_href == "/page2"
+
+
+def test_load_page_skips_parsing_when_bytes_unchanged(cache):
+    fetcher = Mock()
+    fetcher.request.return_value = _response(200, PAGE_HTML)
+    load_page("http://shop/", fetcher, cache)
+    assert cache.get("http://shop/").content_hash == content_hash(PAGE_HTML)
+
+    with patch("utils.extract.parse_page") as mock_parse:
+        page = load_page("http://shop/", fetcher, cache)
+    mock_parse.assert_not_called()
+    assert len(page.products) == 1
+
+    changed = PAGE_HTML.replace(b"Hoodie 3", b"Hoodie 4")
+    fetcher.request.return_value = _response(200, changed)
+    page = load_page("http://shop/", fetcher, cache)
+    assert page.products[0]["Title"] == "Hoodie 4"
@@ -0,0 +1,111 @@
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.parsers import PARSER_ENGINES, PRODUCT_FIELDS, get_parser, parse_rows, parse_with_html_parser
+
+pytest.importorskip("lxml")
+
+CATALOG_HTML = b"""
+<html><body>
+<div class="collection-card">
+    <h3 class="product-title">Hoodie <b>3</b></h3>
+    <div class="price-container"><span class="price">$496.88</span></div>
+    <div class="product-details">
+        <p>Rating: \xe2\xad\x90 4.8 / 5</p><p>3 Colors</p><p>Size: L</p><p>Gender: Unisex</p>
+    </div>
+</div>
+<div class="collection-card featured">
+    <div class="product-details">
+        <h3 class="product-title">Pants 16</h3>
+        <p class="price">Price Unavailable</p><p>Rating: Not Rated</p><p>8 Colors</p><p>Size: S</p>
+    </div>
+</div>
+<div class="collection-card"><h3 class="product-title"></h3></div>
+<div class="collection-card"></div>
+<ul class="pagination">
+    <li class="page-item current"><span class="page-link">1</span></li>
+    <li class="page-item"><a class="page-link" href="/page2">2</a></li>
+    <li class="page-item next"><a class="page-link" href="/page2">Next</a></li>
+</ul>
+</body></html>
+"""
+
+
+def _without_timestamp(products):
+    return [{k: v for k, v in p.items() if k != "Timestamp"} for p in products]
+
+
+@pytest.mark.parametrize("engine", sorted(PARSER_ENGINES))
+def test_engines_match_reference_parser(engine):
+    expected_products, expected_next, expected_hrefs = parse_with_html_parser(CATALOG_HTML)
+    products, next_href, page_hrefs = get_parser(engine)(CATALOG_HTML)
+
+    assert _without_timestamp(products) == _without_timestamp(expected_products)
+    assert (next_href, page_hrefs) == (expected_next, expected_hrefs)
+
+
+@pytest.mark.parametrize("engine", sorted(PARSER_ENGINES))
+def test_parse_rows_returns_tuples_in_field_order(engine):
+    rows, next_href, page_hrefs = parse_rows(CATALOG_HTML, engine)
+    products, expected_next, expected_hrefs = get_parser(engine)(CATALOG_HTML)
+
+    assert all(isinstance(row, tuple) and len(row) == len(PRODUCT_FIELDS) for row in rows)
+    assert _without_timestamp([dict(zip(PRODUCT_FIELDS, row)) for row in rows]) == _without_timestamp(products)
+    assert (next_href, page_hrefs) == (expected_next, expected_hrefs)
+
+
+@pytest.mark.parametrize("engine", sorted(PARSER_ENGINES))
+def test_one_timestamp_per_page(engine):
+    """Semua produk dalam satu halaman berbagi satu timestamp."""
+    rows = parse_rows(CATALOG_HTML, engine)[0]
+
+    assert len({row[-1] for row in rows}) == 1
+
+
+def test_fallback_values_are_preserved():
+    products, next_href, _ = get_parser("lxml")(CATALOG_HTML)
+
+    assert products[0]["Title"] == "Hoodie3"
+    assert products[1]["Price"] == "Unknown Price"
+    assert products[1]["Rating"] == "Price Unavailable"
+    assert products[2]["Title"] == ""
+    assert products[3] == dict(
+        Title="Unknown Product", Price="Unknown Price", Rating="N/A", Colors="N/A", Size="N/A", Gender="N/A",
+        Timestamp=products[3]["Timestamp"],
+    )
+    assert next_href == "/page2"
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError, match="Engine parser tidak dikenal"):
+        get_parser("regex")
+
+
+MALFORMED_CARDS = [
+    '<h3 class="product-title"><script>x</script>T</h3>',
+    '<h3 class="product-title">A<!-- <p>b</p> -->B</h3><span class="price"><style>p {}</style>$1</span>',
+    '<h3 class="product-title"><template>x</template>T</h3>',
+    '<div class="product-details"><p>1<p>2<p>3<p>4</div>',
+    '<div class="product-details"><p>Rating<div>4.8</div>/5</p><p>3 Colors</p></div>',
+    '<div class="product-details"><p>1</p></p><p>2</p></div>',
+    '<div class="product-details"><ul><li><p>1</p><li><p>2</p></ul></div>',
+    '<div class="product-details"><p/>1<p>2</p></div>',
+    '<H3 CLASS="product-title">Upper</H3><DIV class="product-details"><P>1<P>2</DIV>',
+    '<h3 class="product-title"><textarea><p>x</p></textarea>T</h3>',
+    '<h3 class="product-title">Open <b>bold</h3><span class="price">$2</span>',
+]
+
+
+@pytest.mark.parametrize("card", MALFORMED_CARDS)
+def test_lxml_matches_reference_parser_on_malformed_cards(card):
+    """Markup rusak menghasilkan field yang sama persis dengan engine html.parser."""
+    content = f'<html><body><div class="collection-card">{card}</div>' \
+              f'<div class="collection-card"><h3 class="product-title">Next</h3></div></body></html>'.encode()
+
+    expected = parse_with_html_parser(content)[0]
+    products = get_parser("lxml")(content)[0]
+
+    assert _without_timestamp(products) == _without_timestamp(expected)
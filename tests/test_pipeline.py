@@ -0,0 +1,148 @@
+import pytest
+import pandas as pd
+from unittest.mock import patch
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.extract import Page
+from utils.load import CsvSink
+from utils.pipeline import iter_product_batches, run_pipeline
+from utils.transform import clean_data
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def scraped_pages():
+    """Halaman tiruan berisi data mentah asli dari scraped_fashion_products.csv."""
+    raw = pd.read_csv(ROOT / "scraped_fashion_products.csv", dtype=str, keep_default_na=False)
+    records = raw.to_dict("records")
+    count = len(range(0, len(records), 20))
+    return [
+        Page(_page_url(n), records[n * 20:(n + 1) * 20], f"/page{n + 2}" if n + 1 < count else None, [])
+        for n in range(count)
+    ]
+
+
+def _page_url(n):
+    return "http://shop/" if n == 0 else f"http://shop/page{n + 1}"
+
+
+class CollectingSink:
+    name = "collect"
+    upserts = False
+
+    def __init__(self):
+        self.batches = []
+        self.deleted = []
+        self.closed = False
+
+    def write(self, df):
+        self.batches.append(df)
+
+    def delete(self, df):
+        self.deleted.append(df)
+
+    def close(self):
+        self.closed = True
+
+
+def test_iter_product_batches_bounds_batch_size():
+    pages = [Page("p", list(range(7)), None, []), Page("p", list(range(7, 10)), None, [])]
+    assert list(iter_product_batches(pages, batch_size=4)) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_run_pipeline_matches_batch_transform(tmpdir, scraped_pages):
+    expected_path = str(tmpdir.join("expected.csv"))
+    clean_data(str(ROOT / "scraped_fashion_products.csv"), expected_path)
+
+    output_path = str(tmpdir.join("streamed.csv"))
+    raw_path = str(tmpdir.join("raw.csv"))
+    collecting = CollectingSink()
+    with patch("utils.pipeline.iter_fashion_pages", return_value=iter(scraped_pages)):
+        stats = run_pipeline([CsvSink(output_path), collecting], batch_size=64, raw_csv_path=raw_path)
+
+    assert stats["raw_rows"] == 1000
+    assert stats["batches"] == 16
+    assert all(len(batch) <= 64 for batch in collecting.batches)
+    assert collecting.closed
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), pd.read_csv(expected_path))
+    assert len(pd.read_csv(raw_path)) == 1000
+
+
+def test_run_pipeline_drops_duplicates_across_batches():
+    product = {"Title": "Hoodie 3", "Price": "$10.00", "Rating": "Rating: ⭐ 4.8 / 5", "Colors": "3 Colors",
+               "Size": "Size: L", "Gender": "Gender: Men", "Timestamp": "2025-05-21T14:25:48"}
+    missing = dict(product, Title="Pants 4", Gender="N/A")
+    pages = [Page("p1", [product, missing], None, []), Page("p2", [product], None, [])]
+    sink = CollectingSink()
+    with patch("utils.pipeline.iter_fashion_pages", return_value=iter(pages)):
+        stats = run_pipeline([sink], batch_size=2)
+
+    assert stats["clean_rows"] == 1
+    assert pd.concat(sink.batches)["Title"].tolist() == ["Hoodie 3"]
+
+
+def test_run_pipeline_with_cdc_loads_only_changes(tmpdir, scraped_pages):
+    """Run kedua hanya mengirim produk yang berubah dan mencatat produk yang hilang"""
+    from utils.cdc import SnapshotIndex, price_history
+
+    db_path = str(tmpdir.join("changes.sqlite"))
+    with patch("utils.pipeline.iter_fashion_pages", return_value=iter(scraped_pages)):
+        first = run_pipeline([CollectingSink()], batch_size=64, changes=SnapshotIndex(db_path))
+
+    # Halaman terakhir hilang dari katalog: halaman sebelumnya kini tanpa "next".
+    changed_pages = [Page(page.url, [dict(r) for r in page.products], page.next_href if n < len(scraped_pages) - 2 else None, [])
+                     for n, page in enumerate(scraped_pages[:-1])]
+    changed_pages[0].products[1]["Price"] = "$999.00"
+    sink, full = CollectingSink(), CollectingSink()
+    sink.upserts = True
+    with patch("utils.pipeline.iter_fashion_pages", return_value=iter(changed_pages)):
+        second = run_pipeline([sink, full], batch_size=64, changes=SnapshotIndex(db_path))
+
+    assert first["changed_rows"] == first["clean_rows"]
+    assert second["changed_rows"] == 1
+    assert pd.concat(sink.batches)["Price"].tolist() == [999 * 16000.0]
+    assert len(pd.concat(full.batches)) == second["clean_rows"]
+    assert second["deleted_rows"] == first["clean_rows"] - second["clean_rows"]
+    # Produk yang hilang dihapus dari sink upsert; sink lain tidak menerima delete.
+    assert len(pd.concat(sink.deleted)) == second["deleted_rows"]
+    assert full.deleted == []
+    history = price_history(db_path, title=changed_pages[0].products[1]["Title"])
+    assert history["change"].tolist()[-1] == "update"
+
+
+@pytest.mark.parametrize("broken", ["gap", "stopped"])
+def test_run_pipeline_with_cdc_skips_deletes_on_incomplete_crawl(tmpdir, scraped_pages, broken):
+    """Halaman gagal (dilewati mode konkuren atau crawl berhenti) tidak dicatat sebagai produk hilang"""
+    from utils.cdc import SnapshotIndex, price_history
+
+    db_path = str(tmpdir.join("changes.sqlite"))
+    with patch("utils.pipeline.iter_fashion_pages", return_value=iter(scraped_pages)):
+        run_pipeline([CollectingSink()], batch_size=64, changes=SnapshotIndex(db_path))
+
+    pages = scraped_pages[:3] + scraped_pages[4:] if broken == "gap" else scraped_pages[:-1]
+    pages = [Page(page.url, [dict(r) for r in page.products], page.next_href, []) for page in pages]
+    pages[0].products[1]["Price"] = "$999.00"
+    with patch("utils.pipeline.iter_fashion_pages", return_value=iter(pages)):
+        stats = run_pipeline([CollectingSink()], batch_size=64, changes=SnapshotIndex(db_path))
+
+    assert stats["deleted_rows"] == 0
+    assert stats["changed_rows"] == 1
+    # Update tetap tersimpan meskipun deteksi delete dilewati.
+    history = price_history(db_path, title=pages[0].products[1]["Title"])
+    assert history["change"].tolist()[-1] == "update"
+    assert "delete" not in price_history(db_path)["change"].tolist()
+
+
+def test_run_pipeline_resets_metrics_per_run(scraped_pages):
+    from utils.metrics import METRICS
+
+    for _ in range(2):
+        with patch("utils.pipeline.iter_fashion_pages", return_value=iter(scraped_pages)):
+            run_pipeline([CollectingSink()], batch_size=500)
+
+    # 1000 produk per run dalam dua batch: hanya batch run terakhir yang terhitung.
+    assert METRICS.summary()["transform"]["calls"] == 2
@@ -0,0 +1,53 @@
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.parsers import PRODUCT_FIELDS
+from utils.records import ProductBuffer
+
+ROOT = Path(__file__).parent.parent
+
+
+def _products():
+    return pd.read_csv(ROOT / "scraped_fashion_products.csv", keep_default_na=False).to_dict("records")
+
+
+def test_to_frame_matches_list_of_dicts():
+    """DataFrame dari buffer sama persis dengan DataFrame dari list dict."""
+    products = _products()
+    buffer = ProductBuffer()
+    buffer.extend(products)
+
+    assert len(buffer) == len(products)
+    pd.testing.assert_frame_equal(buffer.to_frame(), pd.DataFrame(products, columns=list(PRODUCT_FIELDS)))
+
+
+def test_repeated_values_are_stored_once():
+    """Nilai berulang seperti Size/Gender/Timestamp hanya disimpan sekali."""
+    buffer = ProductBuffer()
+    for n in range(100):
+        buffer.append_row((f"Hoodie {n}", "$10.00", "Rating: ⭐ 4.5 / 5", "3 Colors", "Size: " + "ML"[n % 2],
+                           "Gender: Men", "2025-05-21T14:25:48"))
+
+    df = buffer.to_frame()
+    assert df["Size"].nunique() == 2
+    assert len({id(value) for value in df["Size"]}) == 2
+    assert len({id(value) for value in df["Timestamp"]}) == 1
+
+
+def test_to_frame_categorical():
+    """Mode categorical memakai kode buffer langsung."""
+    buffer = ProductBuffer()
+    buffer.extend_rows([("A", "$1", "r", "1 Colors", "Size: S", "Gender: Men", "t1"),
+                        ("B", "$2", "r", "2 Colors", "Size: M", "Gender: Men", "t1")])
+
+    df = buffer.to_frame(categorical=True)
+    assert df["Size"].dtype == "category"
+    assert df["Size"].astype(str).tolist() == ["Size: S", "Size: M"]
+    assert df["Title"].tolist() == ["A", "B"]
+
+
+def test_empty_buffer():
+    assert ProductBuffer().to_frame().columns.tolist() == list(PRODUCT_FIELDS)
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.rules import Rule, compile_rules, load_rules
+from utils.transform import CLEANING_RULES, DEFAULT_PLAN, RowDeduper, clean_frame
+
+
+@pytest.fixture
+def raw():
+    return pd.DataFrame({
+        "Title": ["Product A", "Unknown Product", "Product B", "Product A"],
+        "Price": ["$10.00", "Unknown Price", "$1,000.50", "$10.00"],
+        "Rating": ["4.5 stars", "Invalid", "3.8 stars", "4.5 stars"],
+        "Colors": ["2 colors", "1 color", "3 colors", "2 colors"],
+        "Size": ["Size: M", "Size: L", "Size: XL", "Size: M"],
+        "Gender": ["Gender: Male", "Gender: Female", "Gender: Unisex", "Gender: Male"],
+        "Timestamp": ["2023-01-01", "2023-01-02", "2023-01-03", "2023-01-01"],
+    })
+
+
+def test_unknown_rule_raises():
+    with pytest.raises(ValueError, match="tidak dikenal"):
+        Rule.from_config({"rule": "uppercase", "column": "Title"})
+    with pytest.raises(ValueError, match="membutuhkan 'column'"):
+        Rule.from_config({"rule": "drop_equal", "value": "x"})
+    with pytest.raises(ValueError, match="dtype"):
+        Rule.from_config({"rule": "cast", "column": "Price", "dtype": "decimal"})
+
+
+def test_explain_runs_filters_first_and_merges_columns():
+    """Filter dijalankan sebelum ekstraksi, dedup paling akhir, dan rule satu kolom digabung."""
+    plan = compile_rules([
+        {"rule": "remove", "column": "Price", "pattern": r"[\$,]"},
+        {"rule": "drop_duplicates"},
+        {"rule": "drop_contains", "column": "Price", "value": "Unknown"},
+        {"rule": "cast", "column": "Price", "dtype": "float"},
+        {"rule": "drop_contains", "column": "Price", "value": "Unavailable"},
+        {"rule": "drop_null"},
+    ])
+    lines = plan.explain().splitlines()
+
+    assert lines[0] == "1. filter semua kolom"
+    assert lines[1].strip() == "drop_null()"
+    assert lines[2] == "2. filter kolom Price (digabung)"
+    assert lines[6].strip() == "drop_duplicates()"
+    assert lines[7] == "4. values kolom Price (digabung)"
+
+
+def test_custom_rules_from_json(tmpdir, raw):
+    path = str(tmpdir.join("rules.json"))
+    rules = [rule for rule in CLEANING_RULES if rule.get("rule") != "convert_currency"]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rules, f)
+
+    cleaned = clean_frame(raw, plan=compile_rules(load_rules(path)))
+
+    assert cleaned["Price"].tolist() == [10.0, 1000.5]
+    assert cleaned["Colors"].tolist() == [2, 3]
+
+
+def test_profile_matches_run(raw):
+    """Mode profil memberi hasil yang sama dan waktu untuk setiap rule."""
+    expected = DEFAULT_PLAN.run(raw)
+    result, timings = DEFAULT_PLAN.profile(raw)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert {str(rule) for rule in DEFAULT_PLAN.rules} <= set(timings)
+    assert "ms" in DEFAULT_PLAN.explain(timings)
+
+
+def test_profile_with_deduper_spans_batches(raw):
+    deduper = RowDeduper()
+    timings = {}
+    first = clean_frame(raw.iloc[:2], deduper, timings=timings)
+    second = clean_frame(raw.iloc[2:], deduper, timings=timings)
+
+    assert first["Title"].tolist() + second["Title"].tolist() == ["Product A", "Product B"]
+
+
+@pytest.mark.parametrize("profile", [False, True])
+def test_plan_without_drop_null_keeps_missing_values(profile):
+    """Nilai kosong tidak ikut di-parsing menjadi nilai unik lain dan tetap kosong."""
+    plan = compile_rules([
+        {"rule": "replace", "column": "Size", "old": "Size: "},
+        {"rule": "drop_contains", "column": "Title", "value": "Unknown"},
+        {"rule": "cast", "column": "Price", "dtype": "float"},
+    ])
+    df = pd.DataFrame({
+        "Title": ["A", None, "B"],
+        "Size": ["Size: M", None, "Size: L"],
+        "Price": ["10", None, "30"],
+    })
+
+    result = plan.profile(df)[0] if profile else plan.run(df)
+
+    assert result["Size"].tolist()[::2] == ["M", "L"]
+    assert pd.isna(result["Size"][1])
+    assert result["Title"].tolist()[::2] == ["A", "B"]
+    assert result["Price"].tolist()[::2] == [10.0, 30.0]
+    assert pd.isna(result["Price"][1])
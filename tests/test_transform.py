@@ -7,7 +7,7 @@ from pathlib import Path
 
 # Fix import path
 sys.path.append(str(Path(__file__).parent.parent))
-from utils.transform import clean_data
+from utils.transform import clean_data, clean_frame, RowDeduper
 
 @pytest.fixture
 def sample_raw_data():
@@ -100,3 +100,118 @@ def test_color_extraction(tmpdir):
     clean_data(input_path, output_path)
     cleaned_df = pd.read_csv(output_path)
     assert cleaned_df["Colors"].tolist() == [3, 5]
+
+def test_row_deduper_spans_batches(sample_raw_data):
+    deduper = RowDeduper()
+    first = deduper.first_seen(sample_raw_data.iloc[:3])
+    second = deduper.first_seen(pd.concat([sample_raw_data.iloc[2:], sample_raw_data.iloc[[4]]]))
+
+    assert first.tolist() == [True, True, True]
+    assert second.tolist() == [False, True, True, False]
+    assert len(deduper) == 5
+
+def test_clean_frame_only_parses_surviving_rows(sample_raw_data):
+    raw = sample_raw_data.copy()
+    # Baris "Unknown Product" membawa harga yang tidak bisa dikonversi; karena
+    # barisnya terbuang, nilai itu tidak boleh memicu error.
+    raw.loc[1, "Price"] = "$abc"
+    cleaned = clean_frame(raw)
+    assert cleaned["Price"].tolist() == [175840.0, 328000.0, 240000.0, 415840.0]
+    assert cleaned["Colors"].dtype == np.int64
+
+def test_clean_frame_rejects_colors_without_number(sample_raw_data):
+    raw = sample_raw_data.copy()
+    raw.loc[0, "Colors"] = "many colors"
+    with pytest.raises(ValueError):
+        clean_frame(raw)
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3])
+def test_clean_data_chunked_matches_full_read(tmpdir, sample_raw_data, expected_clean_data, chunksize):
+    day1 = str(tmpdir.join("day1.csv"))
+    day2 = str(tmpdir.join("day2.csv"))
+    output_path = str(tmpdir.join("clean.csv"))
+    sample_raw_data.iloc[:3].to_csv(day1, index=False)
+    # Hari kedua mengulang baris dari hari pertama: harus terbuang lintas chunk/file.
+    sample_raw_data.iloc[[0, 2, 3, 4, 3]].to_csv(day2, index=False)
+
+    clean_data([day1, day2], output_path, chunksize=chunksize)
+
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), expected_clean_data)
+
+@pytest.mark.parametrize("output", ["clean.csv", "clean.parquet"])
+def test_clean_data_partitioned_matches_serial(tmpdir, monkeypatch, output):
+    """Mode partisi paralel menghasilkan output yang sama dengan mode biasa, termasuk dedup antar partisi."""
+    if output.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+    import utils.partitions
+    monkeypatch.setattr(utils.partitions, "MIN_PARTITION_BYTES", 1)
+    raw = pd.read_csv(Path(__file__).parent.parent / "scraped_fashion_products.csv")
+    day1 = str(tmpdir.join("day1.csv"))
+    day2 = str(tmpdir.join("day2.csv"))
+    # Hari kedua mengulang sebagian baris hari pertama.
+    raw.iloc[:600].to_csv(day1, index=False)
+    raw.iloc[300:].to_csv(day2, index=False)
+    serial = str(tmpdir.join("serial-" + output))
+    parallel = str(tmpdir.join(output))
+
+    clean_data([day1, day2], serial)
+    clean_data([day1, day2], parallel, workers=3)
+
+    read = pd.read_parquet if output.endswith(".parquet") else pd.read_csv
+    pd.testing.assert_frame_equal(read(parallel), read(serial))
+    if output.endswith(".csv"):
+        with open(parallel, "rb") as a, open(serial, "rb") as b:
+            assert a.read() == b.read()
+
+def test_csv_partitions_cover_whole_lines(tmpdir, monkeypatch, sample_raw_data):
+    import utils.partitions
+    from utils.partitions import plan_partitions, read_partition
+    monkeypatch.setattr(utils.partitions, "MIN_PARTITION_BYTES", 1)
+    path = str(tmpdir.join("raw.csv"))
+    sample_raw_data.to_csv(path, index=False)
+
+    partitions = plan_partitions([path], workers=2)
+
+    assert len(partitions) == 4
+    combined = pd.concat([read_partition(p) for p in partitions], ignore_index=True)
+    pd.testing.assert_frame_equal(combined, sample_raw_data)
+
+def test_clean_data_partitioned_keeps_multiline_fields(tmpdir, monkeypatch, sample_raw_data):
+    """Title ber-kutip yang memuat newline tidak terpotong di batas partisi maupun saat dedup."""
+    import utils.partitions
+    from utils.partitions import plan_partitions, read_partition
+    monkeypatch.setattr(utils.partitions, "MIN_PARTITION_BYTES", 1)
+    raw = sample_raw_data.assign(Title=["Product\nA", "Unknown Product", "Product B\r\nTwo", 'Product "D"\n', "C"])
+    path = str(tmpdir.join("raw.csv"))
+    pd.concat([raw, raw, raw], ignore_index=True).to_csv(path, index=False)
+    serial = str(tmpdir.join("serial.csv"))
+    parallel = str(tmpdir.join("parallel.csv"))
+
+    partitions = plan_partitions([path], workers=3)
+    combined = pd.concat([read_partition(p) for p in partitions], ignore_index=True)
+    clean_data(path, serial)
+    clean_data(path, parallel, workers=3)
+
+    assert len(combined) == 15
+    with open(parallel, "rb") as a, open(serial, "rb") as b:
+        assert a.read() == b.read()
+
+@pytest.mark.parametrize("content", ["", "\n"])
+def test_clean_data_partitioned_empty_file_raises(tmpdir, content):
+    input_path = str(tmpdir.join("empty.csv"))
+    with open(input_path, "w") as f:
+        f.write(content)
+    with pytest.raises((ValueError, pd.errors.EmptyDataError)):
+        clean_data(input_path, str(tmpdir.join("clean.csv")), workers=2)
+
+def test_clean_data_partitioned_header_only_writes_header(tmpdir, sample_raw_data):
+    input_path = str(tmpdir.join("header.csv"))
+    sample_raw_data.iloc[:0].to_csv(input_path, index=False)
+    serial = str(tmpdir.join("serial.csv"))
+    parallel = str(tmpdir.join("parallel.csv"))
+
+    clean_data(input_path, serial)
+    clean_data(input_path, parallel, workers=2)
+
+    with open(parallel, "rb") as a, open(serial, "rb") as b:
+        assert a.read() == b.read()
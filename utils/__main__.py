@@ -0,0 +1,83 @@
+"""Entry point CLI pipeline ETL::
+
+    python -m utils run extract|transform|load|all [opsi stage...]
+
+Modul stage baru diimpor saat stage itu dipilih, dan ``utils.load`` hanya
+mengimpor client database/Google untuk sink yang dipakai, sehingga run
+singkat (mis. dari cron) tidak membayar import yang tidak diperlukan.
+Opsi setelah nama stage diteruskan ke CLI stage tersebut, mis.
+``python -m utils run transform --workers 4``. ``--profile-startup``
+menjalankan perintah yang sama dengan ``python -X importtime`` lalu
+menampilkan waktu import per paket.
+"""
+import argparse
+import importlib
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Stage -> modul yang fungsi main(argv)-nya dijalankan.
+STAGES = {
+    "extract": "utils.extract",
+    "transform": "utils.transform",
+    "load": "utils.load",
+    "all": "utils.pipeline",
+}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_stage(stage, argv):
+    """Impor modul ``stage`` lalu jalankan ``main(argv)``-nya; hasilnya kode keluar."""
+    module = importlib.import_module(STAGES[stage])
+    return module.main(argv) or 0
+
+
+def import_breakdown(lines):
+    """Jumlahkan waktu import (``self``, detik) per paket teratas dari output ``-X importtime``."""
+    totals = defaultdict(float)
+    for line in lines:
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            totals[match.group(4).split(".")[0]] += int(match.group(1)) / 1e6
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def profile_startup(stage, argv, top=15):
+    """Jalankan stage di subprocess ``-X importtime`` dan cetak waktu import per paket."""
+    command = [sys.executable, "-X", "importtime", "-m", "utils", "run", stage, *argv]
+    process = subprocess.run(command, stderr=subprocess.PIPE, text=True)
+    lines = process.stderr.splitlines()
+    # Log stage tetap ditampilkan; hanya baris importtime yang diringkas.
+    for line in lines:
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+    totals = import_breakdown(lines)
+    print(f"Waktu import stage {stage!r}: {sum(totals.values()) * 1000:.0f} ms")
+    print(f"{'paket':<28}{'ms':>10}")
+    for package, seconds in list(totals.items())[:top]:
+        print(f"{package:<28}{seconds * 1000:>10.1f}")
+    return process.returncode
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils", description="Pipeline ETL produk fashion")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Jalankan satu stage ETL (all = pipeline streaming)")
+    run.add_argument("--profile-startup", action="store_true",
+                     help="Tampilkan waktu import per paket untuk stage ini")
+    run.add_argument("stage", choices=STAGES)
+    run.add_argument("args", nargs=argparse.REMAINDER, help="Opsi untuk CLI stage (lihat run <stage> --help)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile_startup:
+        return profile_startup(args.stage, args.args)
+    return run_stage(args.stage, args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.columnar import iso_timestamps
+from utils.load import NATURAL_KEY, PRODUCT_COLUMNS
+from utils.metrics import get_logger, stage
+
+logger = get_logger("cdc")
+
+# Snapshot terakhir dan riwayat perubahan disimpan di satu file SQLite di
+# .cache/ (tidak ikut di-commit).
+CDC_DB = Path(__file__).parent.parent / ".cache" / "changes.sqlite"
+
+# Kolom yang dipantau perubahannya; Timestamp selalu baru di setiap scrape
+# sehingga tidak ikut di-hash.
+VALUE_COLUMNS = ["Price", "Rating"]
+
+# Jumlah hash per query ``IN (...)`` (batas parameter SQLite).
+LOOKUP_CHUNK = 500
+
+
+def key_hashes(df):
+    """Hash 64-bit identitas produk (``NATURAL_KEY``) per baris, sebagai ``int64`` agar muat di SQLite."""
+    # Kolom dinormalisasi ke teks: Colors dari CSV dan dari pipeline di-hash sama.
+    keys = pd.DataFrame({
+        column: df[column] if df[column].dtype == object else df[column].astype(str) for column in NATURAL_KEY
+    })
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy().view(np.int64)
+
+
+def value_hashes(df):
+    """Hash 64-bit ``VALUE_COLUMNS`` per baris: berbeda berarti harga/rating berubah."""
+    values = df[VALUE_COLUMNS].astype(float)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy().view(np.int64)
+
+
+@dataclass
+class ChangeSet:
+    """Perubahan satu snapshot dibanding snapshot sebelumnya.
+
+    ``inserts`` dan ``updates`` berisi baris produk lengkap (``updates``
+    ditambah ``Price_old``/``Rating_old``); ``deletes`` berisi identitas
+    produk beserta Price/Rating terakhirnya.
+    """
+    inserts: pd.DataFrame
+    updates: pd.DataFrame
+    deletes: pd.DataFrame
+
+    def __len__(self):
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+    def rows(self):
+        """Baris produk baru atau berubah (urutan input), untuk dimuat ke sink mode upsert."""
+        return pd.concat([self.inserts, self.updates])[PRODUCT_COLUMNS].sort_index(kind="stable")
+
+    def counts(self):
+        return {"insert": len(self.inserts), "update": len(self.updates), "delete": len(self.deletes)}
+
+
+def _empty_deletes():
+    return pd.DataFrame(columns=NATURAL_KEY + VALUE_COLUMNS)
+
+
+class SnapshotIndex:
+    """Indeks hash snapshot sebelumnya untuk change-data-capture antar scrape.
+
+    Per produk hanya disimpan hash identitas (``NATURAL_KEY``) dan hash
+    Price/Rating; di memori keduanya berupa dua array ``int64`` terurut
+    sehingga pencocokan satu batch cukup ``searchsorted``. Hanya produk yang
+    berubah yang ditulis ke tabel ``snapshot`` dan ``history``, jadi biaya
+    tulis mengikuti jumlah perubahan, bukan ukuran katalog.
+
+    Pemakaian: ``capture(df)`` untuk setiap batch snapshot baru, lalu
+    ``finish()`` untuk mendeteksi produk yang hilang dan menyimpan semuanya
+    dalam satu transaksi. Tanpa ``finish()`` (mis. crawl gagal di tengah)
+    tidak ada perubahan yang tersimpan.
+    """
+
+    def __init__(self, db_path=CDC_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._con = sqlite3.connect(db_path)
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS snapshot (
+                key_hash INTEGER PRIMARY KEY,
+                value_hash INTEGER NOT NULL,
+                active INTEGER NOT NULL,
+                "Title" TEXT NOT NULL,
+                "Size" TEXT NOT NULL,
+                "Gender" TEXT NOT NULL,
+                "Colors" TEXT NOT NULL,
+                "Price" REAL,
+                "Rating" REAL
+            )
+        """)
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY,
+                key_hash INTEGER NOT NULL,
+                change TEXT NOT NULL,
+                "Price" REAL,
+                "Rating" REAL,
+                "Timestamp" TEXT NOT NULL
+            )
+        """)
+        self._con.execute("CREATE INDEX IF NOT EXISTS history_key ON history (key_hash, id)")
+        self._con.execute('CREATE INDEX IF NOT EXISTS snapshot_product ON snapshot ("Title", "Size", "Gender")')
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS snapshot_index (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                keys BLOB NOT NULL,
+                value_hashes BLOB NOT NULL
+            )
+        """)
+        self._con.commit()
+        self._load_snapshot()
+
+    def _load_snapshot(self):
+        # Array hash disimpan utuh sebagai blob sehingga dibaca dalam satu
+        # query; tanpa blob (database lama) dibangun dari tabel snapshot.
+        row = self._con.execute("SELECT keys, value_hashes FROM snapshot_index").fetchone()
+        self._index_stored = row is not None
+        if row is not None:
+            self._keys = np.frombuffer(row[0], dtype=np.int64).copy()
+            self._values = np.frombuffer(row[1], dtype=np.int64).copy()
+        else:
+            # key_hash adalah rowid, jadi hasil query sudah terurut tanpa sort.
+            rows = np.array(
+                self._con.execute(
+                    "SELECT key_hash, value_hash FROM snapshot WHERE active = 1 ORDER BY key_hash").fetchall(),
+                dtype=np.int64,
+            ).reshape(-1, 2)
+            self._keys, self._values = rows[:, 0].copy(), rows[:, 1].copy()
+        # Hash nilai produk yang berubah di run ini (menimpa array di atas)
+        # dan semua key yang muncul di snapshot baru.
+        self._pending = {}
+        self._seen = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _previous(self, keys):
+        """``(dikenal, hash_nilai_sebelumnya)`` per key, memperhitungkan perubahan di batch sebelumnya."""
+        known = np.zeros(len(keys), dtype=bool)
+        previous = np.zeros(len(keys), dtype=np.int64)
+        if len(self._keys):
+            position = np.searchsorted(self._keys, keys).clip(max=len(self._keys) - 1)
+            known = self._keys[position] == keys
+            previous = np.where(known, self._values[position], 0)
+        if self._pending:
+            for i in np.flatnonzero(np.isin(keys, np.fromiter(self._pending, dtype=np.int64))):
+                known[i], previous[i] = True, self._pending[int(keys[i])]
+        return known, previous
+
+    def _fetch(self, keys, columns):
+        selected = ", ".join(f'"{column}"' for column in columns)
+        rows = []
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = [int(key) for key in keys[start:start + LOOKUP_CHUNK]]
+            rows += self._con.execute(
+                f"SELECT key_hash, {selected} FROM snapshot WHERE key_hash IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["key_hash"] + columns).set_index("key_hash").reindex(keys)
+
+    def capture(self, df):
+        """Insert dan update dalam ``df`` (satu batch snapshot baru) dibanding snapshot sebelumnya."""
+        with stage("cdc") as record:
+            keys, values = key_hashes(df), value_hashes(df)
+            # Satu baris per produk: kemunculan terakhir di batch yang menang.
+            last = ~pd.Series(keys[::-1]).duplicated().to_numpy()[::-1]
+            self._seen.append(keys)
+            known, previous = self._previous(keys)
+            inserted = last & ~known
+            updated = last & known & (previous != values)
+
+            inserts = df[inserted]
+            old = self._fetch(keys[updated], VALUE_COLUMNS)
+            updates = df[updated].assign(Price_old=old["Price"].to_numpy(), Rating_old=old["Rating"].to_numpy())
+            changed = inserted | updated
+            self._write(df[changed], keys[changed], values[changed], np.where(inserted, "insert", "update")[changed])
+            record.rows_in, record.rows_out = len(df), int(changed.sum())
+        return ChangeSet(inserts, updates, _empty_deletes())
+
+    def _write(self, df, keys, values, changes):
+        products = df[NATURAL_KEY + VALUE_COLUMNS].assign(Timestamp=iso_timestamps(df["Timestamp"])).astype(
+            {"Title": str, "Size": str, "Gender": str, "Colors": str, "Price": float, "Rating": float, "Timestamp": str})
+        columns = [products[column].tolist() for column in products.columns]
+        keys, values = keys.tolist(), values.tolist()
+        self._con.executemany("""
+            INSERT INTO snapshot (key_hash, value_hash, active, "Title", "Size", "Gender", "Colors", "Price", "Rating")
+            VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (key_hash) DO UPDATE SET
+                value_hash = excluded.value_hash, active = 1, "Price" = excluded."Price", "Rating" = excluded."Rating"
+        """, zip(keys, values, *columns[:6]))
+        self._con.executemany(
+            'INSERT INTO history (key_hash, change, "Price", "Rating", "Timestamp") VALUES (?, ?, ?, ?, ?)',
+            zip(keys, changes.tolist(), columns[4], columns[5], columns[6]),
+        )
+        self._pending.update(zip(keys, values))
+
+    def finish(self, captured_at=None, detect_deletes=True):
+        """Catat produk yang tidak muncul lagi sebagai delete lalu simpan semua perubahan; hasilnya ``deletes``.
+
+        Jika tidak ada satu pun batch yang di-capture (mis. scrape kosong),
+        delete tidak dideteksi agar katalog tidak terhapus seluruhnya. Dengan
+        ``detect_deletes=False`` (mis. crawl tidak lengkap) hanya insert dan
+        update yang disimpan; produk yang tidak terlihat tetap aktif.
+
+        Delete hanya dicatat di sini (tabel ``history``); pemanggil yang
+        menghapusnya dari tabel produk saat ini (lihat ``run_pipeline``).
+        """
+        captured_at = captured_at or datetime.now().isoformat()
+        deletes = _empty_deletes()
+        seen = np.concatenate(self._seen) if self._seen else np.empty(0, dtype=np.int64)
+        present = np.isin(self._keys, seen)
+        if not detect_deletes:
+            present[:] = True
+        elif not len(seen):
+            logger.warning("Snapshot kosong: delete tidak dideteksi.")
+            present[:] = True
+        else:
+            gone = self._keys[~present]
+            deletes = self._fetch(gone, NATURAL_KEY + VALUE_COLUMNS).reset_index(drop=True)
+            self._con.executemany("UPDATE snapshot SET active = 0 WHERE key_hash = ?", ((int(k),) for k in gone))
+            self._con.executemany(
+                'INSERT INTO history (key_hash, change, "Timestamp") VALUES (?, \'delete\', ?)',
+                ((int(k), captured_at) for k in gone),
+            )
+        # Snapshot baru menjadi dasar perbandingan berikutnya: cukup digabung
+        # di memori (tanpa produk yang hilang, ditimpa perubahan run ini).
+        # Tanpa perubahan sama sekali, blob snapshot_index tidak ditulis ulang.
+        if len(deletes) or self._pending or not self._index_stored:
+            changed_keys = np.fromiter(self._pending, dtype=np.int64, count=len(self._pending))
+            changed_values = np.fromiter(self._pending.values(), dtype=np.int64, count=len(self._pending))
+            present &= ~np.isin(self._keys, changed_keys)
+            keys = np.concatenate([self._keys[present], changed_keys])
+            values = np.concatenate([self._values[present], changed_values])
+            order = np.argsort(keys, kind="stable")
+            self._keys, self._values = keys[order], values[order]
+            self._con.execute("INSERT OR REPLACE INTO snapshot_index VALUES (1, ?, ?)",
+                              (self._keys.tobytes(), self._values.tobytes()))
+            self._index_stored = True
+        self._con.commit()
+        self._pending, self._seen = {}, []
+        return ChangeSet(pd.DataFrame(columns=PRODUCT_COLUMNS), pd.DataFrame(columns=PRODUCT_COLUMNS), deletes)
+
+    def close(self):
+        """Tutup koneksi; perubahan yang belum di-``finish()`` dibatalkan."""
+        if self._con is not None:
+            self._con.rollback()
+            self._con.close()
+            self._con = None
+
+
+def capture_changes(df, db_path=CDC_DB, captured_at=None):
+    """CDC untuk satu snapshot lengkap: insert, update dan delete dibanding snapshot sebelumnya."""
+    index = SnapshotIndex(db_path)
+    try:
+        changes = index.capture(df)
+        changes.deletes = index.finish(captured_at).deletes
+    finally:
+        index.close()
+    logger.info("Perubahan snapshot: %s", changes.counts())
+    return changes
+
+
+def price_history(db_path=CDC_DB, title=None, size=None, gender=None):
+    """Riwayat perubahan harga/rating per produk (urut waktu), bisa difilter Title/Size/Gender."""
+    where, params = [], []
+    for column, value in (("Title", title), ("Size", size), ("Gender", gender)):
+        if value is not None:
+            where.append(f's."{column}" = ?')
+            params.append(value)
+    sql = """
+        SELECT s."Title", s."Size", s."Gender", s."Colors", h.change, h."Price", h."Rating", h."Timestamp"
+        FROM history h JOIN snapshot s ON s.key_hash = h.key_hash
+    """
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY h.key_hash, h.id"
+    con = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(sql, con, params=params)
+    finally:
+        con.close()
@@ -0,0 +1,101 @@
+import json
+import os
+
+# Setiap produk disimpan sebagai list nilai dengan urutan PRODUCT_FIELDS
+# (bukan dict) agar file checkpoint tetap ringkas.
+from utils.parsers import PRODUCT_FIELDS
+
+
+class CrawlCheckpoint:
+    """Checkpoint crawl append-only dalam format JSON lines.
+
+    Baris pertama adalah header (``base_url`` dan urutan field), lalu satu
+    baris per halaman yang berhasil: URL, link pagination dan produknya.
+    Setiap halaman langsung di-flush ke OS dan di-fsync tiap ``sync_every``
+    halaman. Baris terakhir yang terpotong (proses mati saat menulis)
+    diabaikan dan dibuang saat checkpoint dibuka lagi.
+    """
+
+    def __init__(self, path, base_url, resume=True, sync_every=10):
+        self.path = path
+        self.base_url = base_url
+        self.sync_every = sync_every
+        self._pending = 0
+        self._pages, valid_bytes = self._read() if resume and os.path.exists(path) else ([], 0)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if valid_bytes:
+            self._file = open(path, "r+b")
+            self._file.truncate(valid_bytes)
+            self._file.seek(valid_bytes)
+        else:
+            self._file = open(path, "wb")
+            self._write({"base_url": base_url, "fields": list(PRODUCT_FIELDS)})
+        self._has_pages = bool(self._pages)
+        self._last_next_href = self._pages[-1]["next_href"] if self._pages else None
+
+    def _read(self):
+        pages, valid_bytes = [], 0
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f):
+                if not line.endswith(b"\n"):
+                    break  # baris terakhir terpotong
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if number == 0:
+                    if record.get("base_url") != self.base_url:
+                        raise ValueError(
+                            f"Checkpoint {self.path} milik crawl {record.get('base_url')!r}, bukan {self.base_url!r}"
+                        )
+                    fields = record["fields"]
+                else:
+                    record["products"] = [dict(zip(fields, row)) for row in record["products"]]
+                    pages.append(record)
+                valid_bytes += len(line)
+        return pages, valid_bytes
+
+    @property
+    def finished(self):
+        """``True`` jika halaman terakhir yang tersimpan tidak punya link "next"."""
+        return self._last_next_href is None and self._has_pages
+
+    def pages(self):
+        """Halaman yang sudah tersimpan, sebagai dict ``url/next_href/page_hrefs/products``."""
+        return list(self._pages)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        self._file.flush()
+
+    def append(self, page):
+        """Simpan satu ``Page`` yang berhasil di-crawl."""
+        self._write({
+            "url": page.url,
+            "next_href": page.next_href,
+            "page_hrefs": page.page_hrefs,
+            "products": [[product.get(field) for field in PRODUCT_FIELDS] for product in page.products],
+        })
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._has_pages, self._last_next_href = True, page.next_href
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def remove(self):
+        """Hapus checkpoint setelah hasil crawl tersimpan."""
+        self.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,192 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional; tanpa itu pipeline tetap memakai CSV
+    pa = ipc = pq = None
+
+# Nilai yang dibaca pd.read_csv sebagai NaN secara default. Data yang tidak
+# lewat CSV dinormalisasi dengan daftar yang sama agar dropna() konsisten.
+MISSING_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+IPC_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Format kolumnar membutuhkan paket pyarrow (pip install pyarrow).")
+
+
+def _dictionary():
+    return pa.dictionary(pa.int32(), pa.string())
+
+
+def raw_schema():
+    """Schema data mentah hasil extract: teks kategori di-dictionary-encode."""
+    _require_pyarrow()
+    return pa.schema([
+        ("Title", _dictionary()),
+        ("Price", _dictionary()),
+        ("Rating", _dictionary()),
+        ("Colors", _dictionary()),
+        ("Size", _dictionary()),
+        ("Gender", _dictionary()),
+        ("Timestamp", pa.timestamp("us")),
+    ])
+
+
+def clean_schema():
+    """Schema data bersih: numerik ringkas dan timestamp asli."""
+    _require_pyarrow()
+    return pa.schema([
+        ("Title", _dictionary()),
+        ("Price", pa.float64()),
+        ("Rating", pa.float64()),
+        ("Colors", pa.uint8()),
+        ("Size", _dictionary()),
+        ("Gender", _dictionary()),
+        ("Timestamp", pa.timestamp("us")),
+    ])
+
+
+def mask_missing(df):
+    """Ganti ``MISSING_VALUES`` (mis. fallback ``"N/A"`` scraper) dengan NaN, seperti ``pd.read_csv``."""
+    return df.mask(df.isin(MISSING_VALUES))
+
+
+def iso_timestamps(series):
+    """Timestamp bertipe datetime sebagai teks ``isoformat()`` (format yang sama dengan CSV); NaT menjadi ``None``.
+
+    Kolom yang bukan datetime (mis. dibaca dari CSV) dikembalikan apa adanya.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    # isoformat() per nilai unik: satu Timestamp per halaman hasil crawl.
+    codes, uniques = pd.factorize(series)
+    formatted = np.array([value.isoformat() for value in uniques] + [None], dtype=object)
+    return pd.Series(formatted[codes], index=series.index)
+
+
+def is_columnar(path):
+    """``True`` jika ekstensi ``path`` menandakan Parquet atau Arrow IPC."""
+    return str(path).lower().endswith(PARQUET_EXTENSIONS + IPC_EXTENSIONS)
+
+
+def to_arrow(df, schema):
+    """Konversi DataFrame ke ``pa.Table`` dengan ``schema`` (cast aman, gagal jika overflow)."""
+    _require_pyarrow()
+    df = df[schema.names]
+    if not pd.api.types.is_datetime64_any_dtype(df["Timestamp"]):
+        df = df.assign(Timestamp=pd.to_datetime(df["Timestamp"], format="ISO8601"))
+    return pa.Table.from_pandas(df, preserve_index=False).cast(schema)
+
+
+def write_columnar(df, path, schema):
+    """Simpan DataFrame sebagai Parquet (``.parquet``) atau Arrow IPC (``.arrow``/``.feather``).
+
+    File IPC ditulis tanpa kompresi agar bisa di-memory-map saat dibaca.
+    """
+    table = to_arrow(df, schema)
+    if str(path).lower().endswith(PARQUET_EXTENSIONS):
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(os.fspath(path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_columnar(path, columns=None):
+    """Baca file Parquet/Arrow IPC menjadi DataFrame tanpa parsing teks.
+
+    File IPC di-memory-map; kolom dictionary menjadi ``category``.
+    """
+    _require_pyarrow()
+    if str(path).lower().endswith(PARQUET_EXTENSIONS):
+        table = pq.read_table(path, columns=columns)
+    else:
+        with pa.memory_map(os.fspath(path), "r") as source:
+            table = ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    return table.to_pandas()
+
+
+def iter_columnar_batches(path, batch_size):
+    """Baca file Parquet/Arrow IPC per batch berisi maksimal ``batch_size`` baris."""
+    _require_pyarrow()
+    if str(path).lower().endswith(PARQUET_EXTENSIONS):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+    else:
+        with pa.memory_map(os.fspath(path), "r") as source:
+            table = ipc.open_file(source).read_all()
+            for batch in table.to_batches(max_chunksize=batch_size):
+                yield batch.to_pandas()
+
+
+class ParquetAppender:
+    """Menulis DataFrame bertahap ke satu file Parquet (satu row group per ``write``).
+
+    Dipakai mode chunked/streaming; untuk Arrow IPC lihat ``IpcAppender``.
+    """
+
+    def __init__(self, path, schema):
+        _require_pyarrow()
+        if not str(path).lower().endswith(PARQUET_EXTENSIONS):
+            raise ValueError(f"Penulisan bertahap hanya mendukung Parquet: {path}")
+        self.path = path
+        self.schema = schema
+        self._writer = None
+
+    def write(self, df):
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        self._writer.write_table(to_arrow(df, self.schema))
+
+    def close(self):
+        if self._writer is None:
+            # Tetap hasilkan file valid meski tidak ada batch sama sekali.
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+        self._writer.close()
+
+
+class IpcAppender:
+    """Menulis DataFrame bertahap ke satu file Arrow IPC (satu record batch per ``write``).
+
+    File IPC tidak mendukung dictionary yang berganti antar batch, jadi kolom
+    dictionary pada ``schema`` disimpan sebagai teks biasa.
+    """
+
+    def __init__(self, path, schema):
+        _require_pyarrow()
+        self.path = path
+        self.schema = schema
+        self.file_schema = pa.schema([
+            pa.field(f.name, f.type.value_type if pa.types.is_dictionary(f.type) else f.type) for f in schema
+        ])
+        self._sink = pa.OSFile(os.fspath(path), "wb")
+        self._writer = ipc.new_file(self._sink, self.file_schema)
+
+    def write(self, df):
+        self._writer.write_table(to_arrow(df, self.schema).cast(self.file_schema))
+
+    def close(self):
+        self._writer.close()
+        self._sink.close()
+
+
+def columnar_appender(path, schema):
+    """Appender bertahap sesuai ekstensi ``path``: ``ParquetAppender`` atau ``IpcAppender``."""
+    if str(path).lower().endswith(PARQUET_EXTENSIONS):
+        return ParquetAppender(path, schema)
+    if str(path).lower().endswith(IPC_EXTENSIONS):
+        return IpcAppender(path, schema)
+    raise ValueError(f"Format kolumnar tidak dikenal: {path}")
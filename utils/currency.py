@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import get_logger
+
+logger = get_logger("currency")
+
+# Kurs bawaan ke Rupiah jika tidak ada sumber kurs lain (nilai lama pipeline).
+DEFAULT_RATES = {"USD": 16000}
+
+# Umur cache kurs sebelum sumber kurs ditanya ulang (detik).
+DEFAULT_TTL = 24 * 60 * 60
+
+RATE_COLUMNS = ["date", "currency", "rate"]
+
+
+def _rate_table(records):
+    """DataFrame kurs ``date/currency/rate`` terurut per tanggal (syarat ``merge_asof``)."""
+    table = pd.DataFrame(records, columns=RATE_COLUMNS)
+    table["date"] = pd.to_datetime(table["date"], format="ISO8601")
+    table["currency"] = table["currency"].astype(str).str.upper()
+    table["rate"] = table["rate"].astype(float)
+    return table.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+class StaticRateProvider:
+    """Kurs tetap ``{mata_uang: kurs}``, berlaku untuk semua tanggal."""
+
+    def __init__(self, rates=None):
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.name = f"static:{sorted(self.rates.items())}"
+
+    def fetch(self):
+        return _rate_table([("1970-01-01", currency, rate) for currency, rate in self.rates.items()])
+
+
+class FileRateProvider:
+    """Kurs historis dari file CSV atau JSON (list record) berkolom ``date,currency,rate``."""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f"file:{os.path.abspath(path)}"
+
+    def fetch(self):
+        if str(self.path).lower().endswith(".json"):
+            with open(self.path, encoding="utf-8") as f:
+                return _rate_table(json.load(f))
+        return _rate_table(pd.read_csv(self.path))
+
+
+class HttpRateProvider:
+    """Kurs dari layanan HTTP yang mengembalikan JSON list record ``date/currency/rate``."""
+
+    def __init__(self, url, fetcher=None):
+        self.url = url
+        self.fetcher = fetcher
+        self.name = f"http:{url}"
+
+    def fetch(self):
+        if self.fetcher is None:
+            from utils.fetcher import Fetcher
+            self.fetcher = Fetcher()
+        return _rate_table(self.fetcher.request(self.url).json())
+
+
+class CurrencyConverter:
+    """Konversi harga ke Rupiah berdasarkan mata uang dan tanggal.
+
+    Tabel kurs diambil dari ``provider`` paling banyak sekali per ``ttl``
+    detik: disimpan di memori proses dan, jika ``cache_path`` diberikan, di
+    file JSON agar run berikutnya tidak perlu bertanya ke sumber kurs. Jika
+    sumber kurs gagal, cache yang sudah kedaluwarsa tetap dipakai.
+    """
+
+    def __init__(self, provider=None, cache_path=None, ttl=DEFAULT_TTL):
+        self.provider = provider or StaticRateProvider()
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._table = None
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Lock tidak bisa di-pickle (converter dikirim ke worker transform paralel).
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("provider") != self.provider.name:
+            return None
+        return cached["fetched_at"], _rate_table(cached["rates"])
+
+    def _write_cache(self, table):
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        rates = [[date.isoformat(), currency, rate] for date, currency, rate in table.itertuples(index=False)]
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({"provider": self.provider.name, "fetched_at": self._fetched_at, "rates": rates}, f)
+
+    def rates(self):
+        """Tabel kurs ``date/currency/rate`` yang masih berlaku (diambil ulang setelah TTL)."""
+        with self._lock:
+            if self._table is None and self.cache_path:
+                cached = self._read_cache()
+                if cached is not None:
+                    self._fetched_at, self._table = cached
+            if self._table is not None and time.time() - self._fetched_at < self.ttl:
+                return self._table
+            try:
+                table = self.provider.fetch()
+            except Exception as e:
+                if self._table is None:
+                    raise
+                logger.warning("Gagal memperbarui kurs dari %s, memakai cache lama: %s", self.provider.name, e)
+                return self._table
+            self._table, self._fetched_at = table, time.time()
+            if self.cache_path:
+                self._write_cache(table)
+            return table
+
+    def refresh(self):
+        """Paksa tabel kurs diambil ulang pada pemakaian berikutnya."""
+        with self._lock:
+            self._fetched_at = float("-inf") if self._table is not None else None
+
+    def convert(self, amounts, currency, dates=None):
+        """Kalikan ``amounts`` dengan kurs ``currency`` yang berlaku pada ``dates``.
+
+        ``currency`` boleh satu kode atau array per baris. Kurs dicari dengan
+        satu ``merge_asof`` (kurs terakhir pada atau sebelum tanggalnya) atas
+        kombinasi unik tanggal x mata uang, bukan per baris; tanggal sebelum
+        kurs pertama memakai kurs paling awal, tanggal kosong/invalid memakai
+        kurs terbaru. Mata uang tanpa kurs menghasilkan ``ValueError``.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        if not len(amounts):
+            return amounts
+        # Tanggal dan mata uang di-factorize dulu: teks timestamp cukup
+        # di-parsing sekali per nilai unik (satu per halaman hasil crawl).
+        if dates is None:
+            date_codes, date_uniques = np.zeros(len(amounts), dtype=np.intp), pd.DatetimeIndex([pd.Timestamp.max])
+        else:
+            date_codes, date_uniques = pd.factorize(pd.Series(dates), use_na_sentinel=False)
+            date_uniques = pd.to_datetime(pd.Series(date_uniques, dtype=object), format="ISO8601", errors="coerce")
+            date_uniques = pd.DatetimeIndex(date_uniques.fillna(pd.Timestamp.max))
+        if isinstance(currency, str):
+            currency_codes, currency_uniques = np.zeros(len(amounts), dtype=np.intp), pd.Index([currency.upper()])
+        else:
+            currency_codes, currency_uniques = pd.factorize(pd.Series(currency).astype(str).str.upper())
+
+        codes, pairs = pd.factorize(date_codes * len(currency_uniques) + currency_codes)
+        keys = pd.DataFrame({
+            "date": date_uniques[pairs // len(currency_uniques)],
+            "currency": np.asarray(currency_uniques, dtype=object)[pairs % len(currency_uniques)],
+        })
+        return amounts * self._lookup(keys)[codes]
+
+    def _lookup(self, keys):
+        table = self.rates()
+        missing = set(keys["currency"]) - set(table["currency"])
+        if missing:
+            raise ValueError(f"Kurs tidak tersedia untuk mata uang: {sorted(missing)}")
+        keys = keys.assign(position=np.arange(len(keys))).sort_values("date", kind="stable")
+        matched = pd.merge_asof(keys, table, on="date", by="currency", direction="backward")
+        # Tanggal sebelum kurs pertama: pakai kurs paling awal mata uang tersebut.
+        earliest = table.groupby("currency")["rate"].first()
+        rates = matched["rate"].fillna(matched["currency"].map(earliest))
+        result = np.empty(len(keys))
+        result[matched["position"].to_numpy()] = rates.to_numpy()
+        return result
+
+
+# Converter bawaan: kurs tetap ``DEFAULT_RATES``.
+DEFAULT_CONVERTER = CurrencyConverter()
+
+
+def make_converter(rates_file=None, rates_url=None, cache_path=None, ttl=DEFAULT_TTL):
+    """Converter untuk opsi CLI ``--rates-file``/``--rates-url``; tanpa keduanya ``DEFAULT_CONVERTER``."""
+    if rates_url:
+        return CurrencyConverter(HttpRateProvider(rates_url), cache_path=cache_path, ttl=ttl)
+    if rates_file:
+        return CurrencyConverter(FileRateProvider(rates_file), cache_path=cache_path, ttl=ttl)
+    return DEFAULT_CONVERTER
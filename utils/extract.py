@@ -1,9 +1,27 @@
+import argparse
+import re
+import threading
 import time
-import pandas as pd
 import os
 import requests
-from bs4 import BeautifulSoup
+import sys
+from collections import deque, namedtuple
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Agar tetap bisa dijalankan langsung: python utils/extract.py
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.checkpoint import CrawlCheckpoint
+from utils.columnar import is_columnar, raw_schema, write_columnar
+from utils.fetcher import Fetcher
+from utils.metrics import METRICS, StageRecord, configure_logging, get_logger, stage
+from utils.page_cache import PageCache, conditional_headers, content_hash
+from utils.parsers import PARSER_ENGINES, extract_product_data, get_parser, parse_rows, rows_to_products, safe_get_text
+from utils.records import ProductBuffer
 
 HEADERS = {
     "User-Agent": (
@@ -12,90 +30,436 @@ HEADERS = {
     )
 }
 
+# Hasil parsing satu halaman katalog: produk + link navigasi yang ditemukan.
+Page = namedtuple("Page", ["url", "products", "next_href", "page_hrefs"])
+
+# Folder utama proyek (1 level di atas folder ini)
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+logger = get_logger("extract")
+
+# Memecah href pagination seperti "/page12" menjadi prefix, nomor dan suffix.
+PAGE_NUMBER_PATTERN = re.compile(r"^(.*?)(\d+)(\D*)$")
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_default_fetcher():
+    """Fetcher bersama yang dipakai jika pemanggil tidak memberikan fetcher sendiri."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = Fetcher(headers=HEADERS)
+        return _default_fetcher
+
 
-def fetching_content(url):
+def fetching_content(url, fetcher=None):
     """Mengambil konten HTML dari URL yang diberikan."""
-    session = requests.Session()
-    try:
-        response = session.get(url, headers=HEADERS)
-        response.raise_for_status()
-        return response.content
-    except requests.exceptions.RequestException as e:
-        print(f"Terjadi kesalahan ketika mengakses {url}: {e}")
+    with stage("fetch", url=url) as record:
+        content = (fetcher or get_default_fetcher()).fetch(url)
+        record.bytes = len(content) if content else 0
+        record.ok = content is not None
+    return content
+
+
+class HostRateLimiter:
+    """Membatasi laju request per host dengan jeda minimum antar request.
+
+    Berbeda dengan ``time.sleep`` global, setiap thread hanya menunggu slot
+    untuk host tujuannya sendiri sehingga beberapa request bisa berjalan
+    bersamaan selama jaraknya tetap dijaga.
+    """
+
+    def __init__(self, min_interval):
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def parse_page(url, content, engine=None):
+    """Parsing satu halaman katalog menjadi ``Page`` (produk + link pagination)."""
+    with stage("parse", url=url) as record:
+        products, next_href, page_hrefs = get_parser(engine)(content)
+        record.bytes = len(content)
+        record.rows_out = len(products)
+    return Page(url, products, next_href, page_hrefs)
+
+
+def discover_page_pattern(page):
+    """Menebak pola URL halaman dan jumlah halaman dari pagination halaman pertama.
+
+    Mengembalikan ``(prefix, suffix, last_page)``; ``last_page`` bernilai
+    ``None`` jika pagination tidak menampilkan halaman terakhir. Mengembalikan
+    ``None`` jika halaman tidak punya link "next".
+    """
+    match = PAGE_NUMBER_PATTERN.match(page.next_href or "")
+    if not match:
         return None
+    prefix, number, suffix = match.groups()
+
+    numbers = [int(number)]
+    for href in page.page_hrefs:
+        other = PAGE_NUMBER_PATTERN.match(href)
+        if other and other.group(1) == prefix and other.group(3) == suffix:
+            numbers.append(int(other.group(2)))
+
+    last_page = max(numbers)
+    # Jika yang terlihat hanya link "next", total halaman belum diketahui.
+    return prefix, suffix, (last_page if last_page > int(number) else None)
+
+
+def _cached_page(url, entry):
+    page = entry.page
+    # Produk dipakai ulang tanpa parsing, tetapi Timestamp mengikuti crawl ini.
+    timestamp = datetime.now().isoformat()
+    products = [dict(product, Timestamp=timestamp) for product in page["products"]]
+    return Page(url, products, page["next_href"], page["page_hrefs"])
+
+
+# Hasil tahap I/O satu halaman: ``page`` jika sudah jadi (dari cache), atau
+# ``content`` yang masih perlu di-parsing beserta validator untuk cache.
+Fetched = namedtuple("Fetched", ["page", "content", "validators"])
+
+
+def _fetch_stage(url, fetcher=None, cache=None):
+    """Tahap I/O ``load_page``: ``Fetched`` atau ``None`` jika gagal diambil."""
+    if cache is None:
+        content = fetching_content(url, fetcher)
+        return Fetched(None, content, None) if content else None
+
+    entry = cache.get(url)
+    with stage("fetch", url=url) as record:
+        try:
+            response = (fetcher or get_default_fetcher()).request(url, headers=conditional_headers(entry))
+        except requests.exceptions.RequestException as e:
+            logger.warning("Terjadi kesalahan ketika mengakses %s: %s", url, e)
+            record.ok = False
+            return None
+        record.bytes = len(response.content)
+
+    if response.status_code == 304 and entry is not None:
+        return Fetched(_cached_page(url, entry), None, None)
+
+    validators = (response.headers.get("ETag"), response.headers.get("Last-Modified"), content_hash(response.content))
+    if entry is not None and entry.content_hash == validators[2]:
+        page = _cached_page(url, entry)
+        _store_page(cache, url, validators, page)
+        return Fetched(page, None, None)
+    return Fetched(None, response.content, validators)
+
+
+def _store_page(cache, url, validators, page):
+    if cache is not None and validators is not None:
+        cache.put(url, *validators, {"products": page.products, "next_href": page.next_href,
+                                     "page_hrefs": page.page_hrefs})
+
+
+def load_page(url, fetcher=None, cache=None, parser=None):
+    """Mengambil dan parsing satu halaman; ``None`` jika gagal diambil.
+
+    Dengan ``cache``, request dikirim kondisional (ETag/Last-Modified) dan
+    halaman yang tidak berubah (304 atau hash konten sama) memakai hasil
+    parsing yang tersimpan.
+    """
+    fetched = _fetch_stage(url, fetcher, cache)
+    if fetched is None or fetched.page is not None:
+        return fetched and fetched.page
+    page = parse_page(url, fetched.content, parser)
+    _store_page(cache, url, fetched.validators, page)
+    return page
+
 
+def _fetch_page(url, limiter, fetcher, cache, parser):
+    limiter.wait(url)
+    return load_page(url, fetcher, cache, parser)
 
-def safe_get_text(element, default="N/A"):
-    return element.get_text(strip=True) if element else default
 
-def extract_product_data(card):
-    """Mengambil data produk fashion dari satu card HTML dengan pengecekan yang aman."""
+def _fetch_raw(url, limiter, fetcher, cache):
+    limiter.wait(url)
+    return _fetch_stage(url, fetcher, cache)
+
+
+def _settle(future, result=None, error=None):
+    # Future jendela bisa sudah di-cancel saat crawl berhenti lebih awal.
     try:
-        title = safe_get_text(card.find("h3", class_="product-title"), "Unknown Product")
-        price = safe_get_text(card.find("span", class_="price"), "Unknown Price")
-
-        details = card.select("div.product-details p")
-        rating = safe_get_text(details[0]) if len(details) > 0 else "N/A"
-        colors = safe_get_text(details[1]) if len(details) > 1 else "N/A"
-        size = safe_get_text(details[2]) if len(details) > 2 else "N/A"
-        gender = safe_get_text(details[3]) if len(details) > 3 else "N/A"
-
-        return {
-            "Title": title,
-            "Price": price,
-            "Rating": rating,
-            "Colors": colors,
-            "Size": size,
-            "Gender": gender,
-            "Timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        print(f"Gagal parsing satu produk: {e}")
-        return None
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
 
 
-def scrape_fashion_products(base_url="https://fashion-studio.dicoding.dev/", delay=2):
-    """Scraping semua data produk fashion dari website."""
-    data = []
-    next_page = base_url
+def _submit_split(url, limiter, fetcher, cache, parser, io_pool, parse_pool):
+    """Fetch ``url`` di thread I/O lalu parsing di process pool.
+
+    Thread I/O langsung bebas untuk request berikutnya setelah bytes halaman
+    diterima; parsing (CPU) berjalan paralel di proses lain dan hasilnya
+    kembali sebagai tuple. Mengembalikan Future berisi ``Page`` atau ``None``.
+    """
+    result = Future()
+
+    def parsed(parse_future, fetched):
+        try:
+            rows, next_href, page_hrefs = parse_future.result()
+            page = Page(url, rows_to_products(rows), next_href, page_hrefs)
+            _store_page(cache, url, fetched.validators, page)
+        except BaseException as e:
+            _settle(result, error=e)
+        else:
+            _settle(result, page)
+
+    def fetched_done(fetch_future):
+        try:
+            fetched = fetch_future.result()
+            if fetched is None or fetched.page is not None or result.cancelled():
+                _settle(result, fetched and fetched.page)
+                return
+            parse_future = parse_pool.submit(parse_rows, fetched.content, parser)
+            parse_future.add_done_callback(lambda f: parsed(f, fetched))
+        except BaseException as e:
+            _settle(result, error=e)
 
+    io_pool.submit(_fetch_raw, url, limiter, fetcher, cache).add_done_callback(fetched_done)
+    return result
+
+
+def _iter_pages_sequential(base_url, delay, fetcher, cache, parser, start_url=None):
+    next_page = start_url or base_url
     while next_page:
-        print(f"Scraping halaman: {next_page}")
-        content = fetching_content(next_page)
-        if not content:
+        logger.info("Scraping halaman: %s", next_page)
+        page = load_page(next_page, fetcher, cache, parser)
+        if page is None:
+            logger.warning("Crawl berhenti karena %s gagal diambil.", next_page)
             break
 
-        soup = BeautifulSoup(content, "html.parser")
-        product_cards = soup.find_all("div", class_="collection-card")
-        for card in product_cards:
-            product = extract_product_data(card)
-            if product:
-                data.append(product)
+        yield page
 
-        next_link = soup.select_one("li.page-item.next a")
-        if next_link and next_link.get("href"):
-            next_page = base_url.rstrip("/") + next_link.get("href")
+        if page.next_href:
+            next_page = base_url.rstrip("/") + page.next_href
             time.sleep(delay)
         else:
             break
 
+
+def _iter_pages_concurrent(base_url, workers, limiter, fetcher, cache, parser, first_page=None, start_page=2,
+                           stop_on_failure=False, parse_workers=None):
+    if first_page is None:
+        logger.info("Scraping halaman: %s", base_url)
+        first_page = _fetch_page(base_url, limiter, fetcher, cache, parser)
+        if first_page is None:
+            return
+        yield first_page
+
+    pattern = discover_page_pattern(first_page)
+    if pattern is None:
+        return
+    prefix, suffix, last_page = pattern
+    root = base_url.rstrip("/")
+
+    # Jendela geser: maksimal ``workers * 2`` halaman sedang diproses, hasil
+    # tetap di-yield berurutan sesuai nomor halaman.
+    # Dengan ``parse_workers``, jendela ini sekaligus menjadi antrean terbatas
+    # bytes halaman yang menunggu di-parsing di process pool.
+    window = deque()
+    skipped = []
+    page_no = start_page
+    with ExitStack() as pools:
+        parse_pool = pools.enter_context(ProcessPoolExecutor(parse_workers)) if parse_workers else None
+        executor = pools.enter_context(ThreadPoolExecutor(max_workers=workers))
+        while True:
+            while len(window) < workers * 2 and (last_page is None or page_no <= last_page):
+                url = f"{root}{prefix}{page_no}{suffix}"
+                if parse_pool is None:
+                    future = executor.submit(_fetch_page, url, limiter, fetcher, cache, parser)
+                else:
+                    future = _submit_split(url, limiter, fetcher, cache, parser, executor, parse_pool)
+                window.append((url, future))
+                page_no += 1
+            if not window:
+                break
+
+            url, future = window.popleft()
+            logger.info("Scraping halaman: %s", url)
+            page = future.result()
+            if page is None:
+                if last_page is None:
+                    # Mode probing: halaman gagal dianggap akhir katalog.
+                    logger.warning("Crawl berhenti karena %s gagal diambil (jumlah halaman tidak diketahui).", url)
+                    break
+                if stop_on_failure:
+                    # Dengan checkpoint, berhenti agar halaman tersimpan tetap
+                    # berurutan dan resume bisa melanjutkan dari sini.
+                    logger.warning("Crawl berhenti karena %s gagal diambil.", url)
+                    break
+                skipped.append(url)
+                METRICS.add(StageRecord("crawl.skipped", ok=False, labels={"url": url}))
+                logger.warning("Halaman %s gagal diambil; produknya dilewati.", url)
+                continue
+            yield page
+            if not page.next_href:
+                break
+
+        for _, future in window:
+            future.cancel()
+    if skipped:
+        logger.warning("Crawl tidak lengkap: %d halaman gagal dilewati (%s).", len(skipped), ", ".join(skipped))
+
+
+def _next_page_number(base_url, last_url):
+    """Nomor halaman setelah ``last_url`` (halaman pertama = ``base_url``)."""
+    if last_url == base_url:
+        return 2
+    return int(PAGE_NUMBER_PATTERN.match(urlsplit(last_url).path).group(2)) + 1
+
+
+def iter_fashion_pages(base_url="https://fashion-studio.dicoding.dev/", delay=2, workers=1, rate_limit=None,
+                       fetcher=None, cache=None, parser=None, checkpoint=None, parse_workers=None):
+    """Menghasilkan ``Page`` untuk setiap halaman katalog secara berurutan.
+
+    ``workers`` > 1 mengaktifkan mode konkuren: pola URL dan jumlah halaman
+    dibaca dari pagination halaman pertama, lalu beberapa halaman diambil
+    sekaligus. Laju request dibatasi per host oleh ``rate_limit`` (request per
+    detik; default satu request per ``delay`` detik). Semua request memakai
+    ``fetcher`` (default: fetcher bersama modul ini); ``cache`` (``PageCache``)
+    mengaktifkan crawl ulang inkremental. ``parser`` memilih engine parsing
+    (lihat ``utils.parsers.PARSER_ENGINES``).
+
+    ``parse_workers`` memisahkan parsing dari I/O: thread fetcher hanya
+    mengambil bytes halaman, parsing card berjalan di process pool berisi
+    ``parse_workers`` proses sehingga memakai banyak core. Opsi ini selalu
+    memakai mode konkuren (minimal satu thread fetcher).
+
+    ``checkpoint`` (``CrawlCheckpoint``) menyimpan setiap halaman yang
+    berhasil. Halaman yang sudah ada di checkpoint di-yield ulang tanpa
+    request, lalu crawl dilanjutkan dari halaman terakhir yang berhasil.
+    """
+    saved = [Page(**page) for page in checkpoint.pages()] if checkpoint is not None else []
+    yield from saved
+    if saved and not saved[-1].next_href:
+        return  # crawl sebelumnya sudah selesai
+
+    if workers <= 1 and not parse_workers:
+        start_url = base_url.rstrip("/") + saved[-1].next_href if saved else None
+        pages = _iter_pages_sequential(base_url, delay, fetcher, cache, parser, start_url)
+    else:
+        if workers > 1 and not rate_limit:
+            logger.warning("Mode konkuren tanpa rate_limit: tetap satu request per %.2g detik per host (delay); "
+                           "gunakan --rate-limit agar beberapa halaman benar-benar diambil bersamaan.", delay)
+        limiter = HostRateLimiter(1.0 / rate_limit if rate_limit else delay)
+        resume = {}
+        if saved:
+            resume = {"first_page": saved[0], "start_page": _next_page_number(base_url, saved[-1].url)}
+        pages = _iter_pages_concurrent(base_url, max(1, workers), limiter, fetcher, cache, parser,
+                                       stop_on_failure=checkpoint is not None, parse_workers=parse_workers, **resume)
+
+    for page in pages:
+        if checkpoint is not None:
+            checkpoint.append(page)
+        yield page
+
+
+def scrape_fashion_products(base_url="https://fashion-studio.dicoding.dev/", delay=2, workers=1, rate_limit=None,
+                            fetcher=None, cache=None, parser=None, checkpoint=None, parse_workers=None):
+    """Scraping semua data produk fashion dari website."""
+    data = []
+    for page in iter_fashion_pages(base_url, delay=delay, workers=workers, rate_limit=rate_limit, fetcher=fetcher,
+                                   cache=cache, parser=parser, checkpoint=checkpoint, parse_workers=parse_workers):
+        data.extend(page.products)
     return data
 
 
-def main():
-    """Fungsi utama menjalankan scraping dan menyimpan ke file."""
-    all_products = scrape_fashion_products()
-    df = pd.DataFrame(all_products)
+def scrape_fashion_frame(base_url="https://fashion-studio.dicoding.dev/", **scrape_kwargs):
+    """Seperti ``scrape_fashion_products`` tetapi langsung menghasilkan DataFrame.
+
+    Produk setiap halaman dipindahkan ke ``ProductBuffer`` kolumnar begitu
+    halaman selesai, sehingga crawl besar tidak menahan jutaan dict kecil
+    sebelum DataFrame dibuat.
+    """
+    buffer = ProductBuffer()
+    for page in iter_fashion_pages(base_url, **scrape_kwargs):
+        buffer.extend(page.products)
+    return buffer.to_frame()
 
-    # Tentukan folder utama (1 level di atas folder ini)
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-    # Buat path file CSV di main folder
-    output_path = os.path.join(base_dir, "scraped_fashion_products.csv")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraping produk fashion-studio.dicoding.dev")
+    parser.add_argument("--base-url", default="https://fashion-studio.dicoding.dev/")
+    parser.add_argument("--delay", type=float, default=2, help="Jeda antar halaman pada mode sekuensial (detik)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Jumlah halaman yang diambil bersamaan (laju tetap dibatasi --rate-limit, "
+                             "default satu request per --delay detik per host)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Maksimum request per detik per host")
+    parser.add_argument("--timeout", type=float, default=30, help="Timeout baca per request (detik)")
+    parser.add_argument("--retries", type=int, default=3, help="Jumlah retry untuk error 5xx/429/koneksi")
+    parser.add_argument("--parser", choices=sorted(PARSER_ENGINES), default=None,
+                        help="Engine parsing HTML (default: $ETL_PARSER_ENGINE atau html.parser)")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Jumlah proses untuk parsing (memisahkan parsing dari I/O jaringan)")
+    parser.add_argument("--output", default=os.path.join(BASE_DIR, "scraped_fashion_products.csv"),
+                        help="File output (.csv, .parquet, atau .arrow)")
+    parser.add_argument("--no-cache", action="store_true", help="Nonaktifkan cache halaman (crawl penuh)")
+    parser.add_argument("--cache-path", default=os.path.join(BASE_DIR, ".cache", "pages.sqlite"))
+    parser.add_argument("--cache-size", type=int, default=64, help="Batas ukuran cache halaman (MB)")
+    parser.add_argument("--checkpoint", default=os.path.join(BASE_DIR, ".cache", "crawl-checkpoint.jsonl"),
+                        help="File checkpoint crawl (append-only, dihapus setelah crawl selesai)")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Nonaktifkan checkpoint crawl")
+    parser.add_argument("--resume", action="store_true", help="Lanjutkan crawl dari checkpoint terakhir")
+    parser.add_argument("--log-level", default="INFO", help="Level log (DEBUG, INFO, WARNING, ...)")
+    parser.add_argument("--metrics-out", help="Simpan metrik per stage ke file .jsonl atau .prom (Prometheus)")
+    return parser.parse_args(argv)
 
-    df.to_csv(output_path, index=False)
-    print(f"Scraping selesai. Data disimpan di '{output_path}'")
-    print(df.head())
+
+def main(argv=None):
+    """Fungsi utama menjalankan scraping dan menyimpan ke file."""
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+    cache = None if args.no_cache else PageCache(args.cache_path, max_bytes=args.cache_size * 1024 * 1024)
+    checkpoint = None if args.no_checkpoint else CrawlCheckpoint(args.checkpoint, args.base_url, resume=args.resume)
+    if checkpoint is not None and checkpoint.pages():
+        logger.info("Melanjutkan crawl: %d halaman dari checkpoint '%s'", len(checkpoint.pages()), args.checkpoint)
+    with Fetcher(headers=HEADERS, pool_size=max(10, args.workers), timeout=(5, args.timeout),
+                 max_retries=args.retries) as fetcher:
+        df = scrape_fashion_frame(
+            args.base_url, delay=args.delay, workers=args.workers, rate_limit=args.rate_limit, fetcher=fetcher,
+            cache=cache, parser=args.parser, checkpoint=checkpoint, parse_workers=args.parse_workers,
+        )
+        stats = fetcher.summary()
+    if cache is not None:
+        cache.close()
+    logger.info(
+        "Fetch: %d halaman, %d bytes, %.2fs latensi, %d retry, %d gagal",
+        stats["pages"], stats["bytes"], stats["latency"], stats["retries"], stats["failed"],
+    )
+
+    output_path = args.output
+    with stage("write", path=str(output_path)) as record:
+        if is_columnar(output_path):
+            write_columnar(df, output_path, raw_schema())
+        else:
+            df.to_csv(output_path, index=False)
+        record.rows_out = len(df)
+    logger.info("Scraping selesai. Data disimpan di '%s'", output_path)
+    if checkpoint is not None:
+        if checkpoint.finished:
+            checkpoint.remove()
+        else:
+            checkpoint.close()
+            logger.warning("Crawl belum lengkap; jalankan ulang dengan --resume untuk melanjutkan.")
+    logger.debug("%s", df.head())
+    if args.metrics_out:
+        METRICS.export(args.metrics_out)
 
 
 if __name__ == "__main__":
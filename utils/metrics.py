@@ -0,0 +1,183 @@
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory tidak tersedia
+    resource = None
+
+# Semua logger pipeline berada di bawah "etl" (etl.extract, etl.transform, ...)
+# sehingga levelnya bisa diatur sekaligus, mis. WARNING untuk mematikan log
+# per halaman/batch.
+LOGGER_NAME = "etl"
+
+PROMETHEUS_EXTENSIONS = (".prom", ".txt")
+
+# Jumlah StageRecord terakhir yang disimpan per recorder (untuk export JSON
+# lines). Agregat per stage tetap menghitung semua record.
+MAX_RECORDS = 10_000
+
+
+def get_logger(name):
+    """Logger ``etl.<name>`` untuk satu modul pipeline."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def configure_logging(level="INFO"):
+    """Pasang handler stderr sederhana untuk logger ``etl`` (dipakai oleh CLI)."""
+    logger = logging.getLogger(LOGGER_NAME)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageRecord:
+    """Ukuran satu eksekusi stage (satu halaman, satu batch, satu load, ...).
+
+    ``cpu_seconds`` adalah waktu CPU thread pemanggil; ``peak_rss_bytes``
+    adalah puncak memori proses saat stage selesai.
+    """
+    stage: str
+    started: float = 0.0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    rows_in: int = 0
+    rows_out: int = 0
+    bytes: int = 0
+    ok: bool = True
+    labels: dict = field(default_factory=dict)
+
+
+class MetricsRecorder:
+    """Mengumpulkan ``StageRecord`` dari seluruh pipeline (aman dipakai lintas thread).
+
+    Agregat per stage diperbarui setiap record masuk, sedangkan record
+    mentahnya hanya disimpan ``max_records`` terakhir, sehingga memori tetap
+    terbatas untuk proses yang berjalan lama.
+    """
+
+    def __init__(self, enabled=True, max_records=MAX_RECORDS):
+        self.enabled = enabled
+        self._records = deque(maxlen=max_records)
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, **labels):
+        """Ukur blok kode sebagai stage ``name``.
+
+        Yield ``StageRecord`` yang field ``rows_in``/``rows_out``/``bytes``-nya
+        diisi pemanggil. Saat recorder dimatikan, record tidak diukur maupun
+        disimpan sehingga biayanya hampir nol.
+        """
+        record = StageRecord(name, labels=labels)
+        if not self.enabled:
+            yield record
+            return
+        record.started = time.time()
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        except BaseException:
+            record.ok = False
+            raise
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.thread_time() - cpu
+            record.peak_rss_bytes = _peak_rss_bytes()
+            self._append(record)
+
+    def add(self, record):
+        """Simpan ``StageRecord`` yang diukur di tempat lain (mis. di proses worker)."""
+        if self.enabled:
+            self._append(record)
+
+    def _append(self, record):
+        with self._lock:
+            self._records.append(record)
+            total = self._totals.setdefault(record.stage, {
+                "calls": 0, "errors": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "rows_in": 0, "rows_out": 0, "bytes": 0, "peak_rss_bytes": 0,
+            })
+            total["calls"] += 1
+            total["errors"] += not record.ok
+            total["wall_seconds"] += record.wall_seconds
+            total["cpu_seconds"] += record.cpu_seconds
+            total["rows_in"] += record.rows_in
+            total["rows_out"] += record.rows_out
+            total["bytes"] += record.bytes
+            total["peak_rss_bytes"] = max(total["peak_rss_bytes"], record.peak_rss_bytes)
+
+    def records(self):
+        """``max_records`` record terakhir, urut sesuai waktu selesai."""
+        with self._lock:
+            return list(self._records)
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+            self._totals.clear()
+
+    def summary(self):
+        """Agregat per stage: jumlah eksekusi, error, waktu, baris dan bytes (semua record sejak ``reset``)."""
+        with self._lock:
+            return {name: dict(total) for name, total in self._totals.items()}
+
+    def to_jsonl(self):
+        """Satu baris JSON per ``StageRecord`` yang masih disimpan (lihat ``max_records``)."""
+        return "".join(json.dumps(asdict(record), ensure_ascii=False) + "\n" for record in self.records())
+
+    def to_prometheus(self):
+        """Agregat per stage dalam format teks Prometheus (untuk node_exporter textfile)."""
+        summary = self.summary()
+        lines = []
+        for key, kind, help_text in (
+            ("calls", "counter", "Jumlah eksekusi stage."),
+            ("errors", "counter", "Jumlah eksekusi stage yang gagal."),
+            ("wall_seconds", "counter", "Total waktu wall-clock stage."),
+            ("cpu_seconds", "counter", "Total waktu CPU stage."),
+            ("rows_in", "counter", "Total baris masuk stage."),
+            ("rows_out", "counter", "Total baris keluar stage."),
+            ("bytes", "counter", "Total bytes yang diproses stage."),
+            ("peak_rss_bytes", "gauge", "Puncak memori proses selama stage."),
+        ):
+            metric = f"etl_stage_{key}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for stage, total in sorted(summary.items()):
+                lines.append(f'{metric}{{stage="{stage}"}} {total[key]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Tulis metrik ke ``path``: teks Prometheus untuk ``.prom``/``.txt``, selain itu JSON lines."""
+        text = self.to_prometheus() if str(path).lower().endswith(PROMETHEUS_EXTENSIONS) else self.to_jsonl()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Recorder bersama untuk satu proses pipeline.
+METRICS = MetricsRecorder()
+
+
+def stage(name, **labels):
+    """``METRICS.stage``: ukur satu stage pada recorder bersama."""
+    return METRICS.stage(name, **labels)
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheEntry:
+    """Satu halaman tersimpan: validator HTTP, hash konten dan hasil parsingnya."""
+    url: str
+    etag: str | None
+    last_modified: str | None
+    content_hash: str
+    page: dict
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+class PageCache:
+    """Cache halaman di disk (SQLite) untuk crawl ulang yang inkremental.
+
+    Disimpan per URL: ETag/Last-Modified untuk request kondisional, hash
+    konten untuk mendeteksi halaman yang bytes-nya tidak berubah, dan hasil
+    parsing (produk + link pagination) agar halaman yang sama tidak perlu
+    di-parsing ulang. Ukuran total dibatasi ``max_bytes`` dengan eviksi LRU.
+    """
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._con.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                page TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._con.execute("CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)")
+        self._con.commit()
+
+    def get(self, url):
+        """Ambil entry untuk ``url`` (sekaligus menandainya baru dipakai) atau ``None``."""
+        with self._lock:
+            row = self._con.execute(
+                "SELECT etag, last_modified, content_hash, page FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._con.execute("UPDATE pages SET last_used = ? WHERE url = ?", (time.time(), url))
+            self._con.commit()
+        etag, last_modified, digest, page = row
+        return CacheEntry(url, etag, last_modified, digest, json.loads(page))
+
+    def put(self, url, etag, last_modified, digest, page):
+        payload = json.dumps(page, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, digest, payload, len(payload), time.time()),
+            )
+            self._evict()
+            self._con.commit()
+
+    def _evict(self):
+        total = self._con.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._con.execute("SELECT url, size FROM pages ORDER BY last_used").fetchall():
+            self._con.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def __len__(self):
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def conditional_headers(entry):
+    """Header request kondisional (If-None-Match/If-Modified-Since) untuk ``entry``."""
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+    return headers
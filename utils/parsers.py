@@ -0,0 +1,225 @@
+import os
+import re
+from datetime import datetime
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+from utils.metrics import get_logger
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml opsional; engine "html.parser" tetap tersedia
+    etree = None
+    lxml_html = None
+
+logger = get_logger("parsers")
+
+# Engine parser default, bisa diganti lewat environment ETL_PARSER_ENGINE.
+DEFAULT_PARSER_ENGINE = os.environ.get("ETL_PARSER_ENGINE", "html.parser")
+
+
+# Urutan field produk. Engine parser menghasilkan tuple dengan urutan ini
+# (ringkas untuk dikirim antar proses); versi dict dibuat dari tuple tersebut.
+PRODUCT_FIELDS = ("Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp")
+
+
+def safe_get_text(element, default="N/A"):
+    return element.get_text(strip=True) if element else default
+
+def extract_product_values(card, timestamp=None):
+    """Seperti ``extract_product_data`` tetapi mengembalikan tuple sesuai ``PRODUCT_FIELDS``."""
+    try:
+        title = safe_get_text(card.find("h3", class_="product-title"), "Unknown Product")
+        price = safe_get_text(card.find("span", class_="price"), "Unknown Price")
+
+        details = card.select("div.product-details p")
+        rating = safe_get_text(details[0]) if len(details) > 0 else "N/A"
+        colors = safe_get_text(details[1]) if len(details) > 1 else "N/A"
+        size = safe_get_text(details[2]) if len(details) > 2 else "N/A"
+        gender = safe_get_text(details[3]) if len(details) > 3 else "N/A"
+
+        return (title, price, rating, colors, size, gender, timestamp or datetime.now().isoformat())
+    except Exception as e:
+        logger.warning("Gagal parsing satu produk: %s", e)
+        return None
+
+def extract_product_data(card):
+    """Mengambil data produk fashion dari satu card HTML dengan pengecekan yang aman."""
+    values = extract_product_values(card)
+    return dict(zip(PRODUCT_FIELDS, values)) if values else None
+
+
+def rows_to_products(rows):
+    """Ubah tuple produk menjadi dict ``{field: nilai}``."""
+    return [dict(zip(PRODUCT_FIELDS, row)) for row in rows]
+
+
+def parse_rows_with_html_parser(content):
+    """Engine referensi: BeautifulSoup + ``html.parser``; produk sebagai tuple."""
+    soup = BeautifulSoup(content, "html.parser")
+    # Semua card satu halaman diambil pada saat yang sama: satu timestamp per halaman.
+    timestamp = datetime.now().isoformat()
+    rows = []
+    for card in soup.find_all("div", class_="collection-card"):
+        values = extract_product_values(card, timestamp)
+        if values:
+            rows.append(values)
+
+    next_link = soup.select_one("li.page-item.next a")
+    next_href = next_link.get("href") if next_link and next_link.get("href") else None
+    page_hrefs = [a.get("href") for a in soup.select("li.page-item a") if a.get("href")]
+    return rows, next_href, page_hrefs
+
+
+def parse_with_html_parser(content):
+    """Engine referensi: BeautifulSoup + ``html.parser``."""
+    rows, next_href, page_hrefs = parse_rows_with_html_parser(content)
+    return rows_to_products(rows), next_href, page_hrefs
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if etree is not None:
+    # XPath dikompilasi sekali; setara dengan selector BeautifulSoup di atas.
+    _CARDS = etree.XPath(f"//div[{_has_class('collection-card')}]")
+    _TITLE = etree.XPath(f"(.//h3[{_has_class('product-title')}])[1]")
+    _PRICE = etree.XPath(f"(.//span[{_has_class('price')}])[1]")
+    _DETAILS = etree.XPath(f".//div[{_has_class('product-details')}]//p")
+    _NEXT_HREF = etree.XPath(f"(//li[{_has_class('page-item')} and {_has_class('next')}]//a)[1]/@href")
+    _PAGE_HREFS = etree.XPath(f"//li[{_has_class('page-item')}]//a/@href")
+    # Teks yang diabaikan BeautifulSoup.get_text() tidak ikut diambil.
+    _TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+def _lxml_text(elements, default="N/A"):
+    # Sama dengan get_text(strip=True): setiap potongan teks di-strip lalu
+    # digabung, tanpa isi <script>/<style>/<template> (lihat _TEXT).
+    if not elements:
+        return default
+    return "".join(piece.strip() for piece in _TEXT(elements[0]))
+
+
+# Isi <script>/<style> (teks mentah bagi kedua parser) dan komentar dibuang
+# sebelum struktur tag diperiksa.
+_RAW_TEXT = re.compile(r"<(script|style)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)([^>]*)>")
+_VOID_TAGS = frozenset("area base br col embed hr img input link meta param source track wbr".split())
+# Tag blok yang menutup <p> yang masih terbuka pada parser HTML lxml.
+_CLOSES_P = frozenset(
+    "address article aside blockquote center dd details dir div dl dt fieldset figcaption figure footer form "
+    "h1 h2 h3 h4 h5 h6 header hr li main menu nav ol p pre section table ul".split()
+)
+# Isi tag ini dibaca lxml sebagai teks biasa, html.parser tetap mem-parsing tag.
+_TEXT_ONLY_TAGS = frozenset(("textarea", "title"))
+# Tag yang ditutup otomatis oleh tag sejenis berikutnya (mis. <li> tanpa </li>).
+_SELF_CLOSING_SIBLINGS = frozenset("dd dt li option td th tr".split())
+
+
+def _lxml_matches_html_parser(content):
+    """``True`` jika pohon lxml untuk ``content`` sama dengan pohon ``html.parser``.
+
+    ``html.parser`` tidak pernah menutup tag secara implisit (``<p>1<p>2``
+    menjadi p bersarang), sedangkan lxml mengikuti aturan HTML. Hasil kedua
+    engine hanya bisa berbeda jika markup tidak tersarang rapi, jadi setiap
+    tag tutup harus cocok dengan tag buka terakhir, tidak ada tag blok di
+    dalam ``<p>`` dan tidak ada ``<li>`` (dan sejenisnya) langsung di dalam
+    tag yang sama.
+    """
+    if _RAW_TEXT.search(content):
+        content = _RAW_TEXT.sub("", content)
+    stack = []
+    open_p = 0
+    for closing, tag, attributes in _TAG.findall(content):
+        tag = tag.lower()
+        if tag in _VOID_TAGS:
+            continue
+        if stack and stack[-1] in _TEXT_ONLY_TAGS and not (closing and stack[-1] == tag):
+            return False  # lxml membaca tag di dalam <textarea>/<title> sebagai teks
+        if closing:
+            if not stack or stack.pop() != tag:
+                return False
+            open_p -= tag == "p"
+        elif attributes.endswith("/"):
+            return False  # <p/>: html.parser menutupnya, lxml tidak
+        else:
+            if (open_p and tag in _CLOSES_P) or (tag in _SELF_CLOSING_SIBLINGS and stack and stack[-1] == tag):
+                return False
+            stack.append(tag)
+            open_p += tag == "p"
+    return True
+
+
+def parse_rows_with_lxml(content):
+    """Engine cepat: lxml + XPath terkompilasi, semua field diambil dalam satu lintasan per card."""
+    if etree is None:
+        raise RuntimeError("Engine parser 'lxml' membutuhkan paket lxml (pip install lxml).")
+
+    if isinstance(content, bytes):
+        # Seperti BeautifulSoup: utamakan UTF-8, selebihnya deteksi encoding.
+        try:
+            content = content.decode("utf-8")
+        except UnicodeDecodeError:
+            content = UnicodeDammit(content).unicode_markup
+    if not _lxml_matches_html_parser(content):
+        # Markup rusak: pakai engine referensi agar hasilnya tetap identik.
+        return parse_rows_with_html_parser(content)
+    root = lxml_html.fromstring(content)
+    timestamp = datetime.now().isoformat()
+    rows = []
+    for card in _CARDS(root):
+        details = _DETAILS(card)
+        rows.append((
+            _lxml_text(_TITLE(card), "Unknown Product"),
+            _lxml_text(_PRICE(card), "Unknown Price"),
+            _lxml_text(details[0:1]),
+            _lxml_text(details[1:2]),
+            _lxml_text(details[2:3]),
+            _lxml_text(details[3:4]),
+            timestamp,
+        ))
+
+    next_href = _NEXT_HREF(root)
+    page_hrefs = [href for href in _PAGE_HREFS(root) if href]
+    return rows, (next_href[0] or None) if next_href else None, page_hrefs
+
+
+def parse_with_lxml(content):
+    """Engine cepat: lxml + XPath terkompilasi, semua field diambil dalam satu lintasan per card."""
+    rows, next_href, page_hrefs = parse_rows_with_lxml(content)
+    return rows_to_products(rows), next_href, page_hrefs
+
+
+PARSER_ENGINES = {
+    "html.parser": parse_with_html_parser,
+    "lxml": parse_with_lxml,
+}
+
+# Versi tuple dari setiap engine, dipakai parsing di process pool.
+ROW_PARSER_ENGINES = {
+    "html.parser": parse_rows_with_html_parser,
+    "lxml": parse_rows_with_lxml,
+}
+
+
+def _engine_name(engine):
+    engine = engine or DEFAULT_PARSER_ENGINE
+    if engine not in PARSER_ENGINES:
+        raise ValueError(f"Engine parser tidak dikenal: {engine!r} (pilihan: {sorted(PARSER_ENGINES)})")
+    return engine
+
+
+def get_parser(engine=None):
+    """Ambil fungsi parser untuk ``engine`` (default ``DEFAULT_PARSER_ENGINE``)."""
+    return PARSER_ENGINES[_engine_name(engine)]
+
+
+def parse_rows(content, engine=None):
+    """Parsing satu halaman menjadi ``(tuple produk, next_href, page_hrefs)``.
+
+    Fungsi tingkat modul (bisa di-pickle) untuk ``ProcessPoolExecutor``:
+    hasil tuple jauh lebih ringkas dikirim antar proses dibanding dict.
+    """
+    return ROW_PARSER_ENGINES[_engine_name(engine)](content)
@@ -0,0 +1,246 @@
+import io
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import compress
+
+import pandas as pd
+
+from utils.columnar import IPC_EXTENSIONS, PARQUET_EXTENSIONS, ipc, mask_missing, pa, pq
+from utils.metrics import MetricsRecorder, StageRecord
+
+# Jumlah partisi per worker: sedikit lebih banyak dari jumlah worker agar
+# worker yang selesai lebih cepat bisa mengambil partisi berikutnya.
+PARTITIONS_PER_WORKER = 2
+
+# Partisi CSV lebih kecil dari ini tidak sebanding dengan biaya prosesnya.
+MIN_PARTITION_BYTES = 1024 * 1024
+
+# Ukuran blok saat memindai tanda kutip menuju batas partisi CSV.
+READ_BLOCK_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Partition:
+    """Potongan input untuk satu worker.
+
+    ``kind`` ``csv``: rentang byte ``[start, stop)`` yang selalu berakhir di
+    akhir record; ``parquet``: row group ``[start, stop)``; ``ipc``: record
+    batch ``[start, stop)`` file Arrow IPC.
+    """
+    path: str
+    kind: str
+    start: int
+    stop: int
+
+
+@dataclass
+class PartitionResult:
+    """Hasil satu partisi beserta hash baris mentahnya untuk dedup global.
+
+    Untuk output CSV, worker sudah menulis hasilnya sebagai file CSV
+    (``csv_path``) sehingga induk cukup menyambung bytes; selain itu hasil
+    tersedia sebagai ``frame``.
+    """
+    partition: Partition
+    rows_in: int
+    rows_out: int
+    frame: pd.DataFrame
+    csv_path: str
+    hashes: object
+    timings: dict
+    record: StageRecord
+
+
+def _kind(path):
+    lower = str(path).lower()
+    if lower.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    if lower.endswith(IPC_EXTENSIONS):
+        return "ipc"
+    return "csv"
+
+
+def _split(count, parts):
+    """Bagi ``range(count)`` menjadi maksimal ``parts`` rentang berurutan yang tidak kosong."""
+    parts = max(1, min(parts, count))
+    bounds = [count * i // parts for i in range(parts + 1)]
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def _csv_partitions(path, parts):
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()  # header
+        data_start = f.tell()
+        parts = max(1, min(parts, (size - data_start) // MIN_PARTITION_BYTES))
+        # Batas partisi digeser ke awal record berikutnya. Field ber-kutip
+        # boleh memuat newline (mis. Title multi-baris), jadi newline hanya
+        # dianggap akhir record jika jumlah tanda kutip sejak awal data genap.
+        bounds = [data_start]
+        pos, quotes = data_start, 0
+        for i in range(1, parts):
+            target = max(bounds[-1], data_start + (size - data_start) * i // parts)
+            while pos < target:
+                block = f.read(min(READ_BLOCK_BYTES, target - pos))
+                quotes += block.count(b'"')
+                pos += len(block)
+            while pos < size:
+                line = f.readline()
+                quotes += line.count(b'"')
+                pos += len(line)
+                if quotes % 2 == 0:
+                    break
+            bounds.append(pos)
+        bounds.append(size)
+    partitions = [Partition(str(path), "csv", start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+    # File tanpa baris data tetap diproses satu partisi kosong: header-only
+    # menghasilkan output ber-header dan file kosong gagal seperti mode biasa.
+    return partitions or [Partition(str(path), "csv", data_start, data_start)]
+
+
+def plan_partitions(paths, workers):
+    """Bagi ``paths`` menjadi partisi: per file, dan file besar dipecah lagi per rentang baris."""
+    per_file = math.ceil(workers * PARTITIONS_PER_WORKER / len(paths))
+    partitions = []
+    for path in paths:
+        kind = _kind(path)
+        if kind == "csv":
+            partitions += _csv_partitions(path, per_file)
+        elif kind == "parquet":
+            groups = pq.ParquetFile(path).num_row_groups
+            partitions += [Partition(str(path), kind, a, b) for a, b in _split(groups, per_file)]
+        else:
+            with pa.memory_map(os.fspath(path), "r") as source:
+                batches = ipc.open_file(source).num_record_batches
+            partitions += [Partition(str(path), kind, a, b) for a, b in _split(batches, per_file)]
+    return partitions
+
+
+def read_partition(partition):
+    """Baca satu partisi langsung dari file (worker tidak menerima data lewat pickle)."""
+    if partition.kind == "csv":
+        with open(partition.path, "rb") as f:
+            header = f.readline()
+            f.seek(partition.start)
+            data = f.read(partition.stop - partition.start)
+        # dtype=str seperti mode chunk: hash baris tidak bergantung pada
+        # inferensi tipe per partisi.
+        return pd.read_csv(io.BytesIO(header + data), dtype=str)
+    # File kolumnar menyimpan fallback "N/A" apa adanya; samakan dengan CSV.
+    if partition.kind == "parquet":
+        table = pq.ParquetFile(partition.path).read_row_groups(range(partition.start, partition.stop))
+        return mask_missing(table.to_pandas())
+    with pa.memory_map(partition.path, "r") as source:
+        reader = ipc.open_file(source)
+        batches = [reader.get_batch(i) for i in range(partition.start, partition.stop)]
+        return mask_missing(pa.Table.from_batches(batches).to_pandas())
+
+
+class _PartitionHashes:
+    """Pengganti ``RowDeduper`` di worker: dedup di dalam partisi dan simpan hash baris yang tersisa."""
+
+    def __init__(self):
+        self.hashes = None
+
+    def first_seen(self, df):
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        new = ~pd.Series(hashes).duplicated().to_numpy()
+        self.hashes = hashes[new]
+        return pd.Series(new, index=df.index, dtype=bool)
+
+
+def _clean_partition(number, partition, plan, converter, out_dir, profile, csv_output):
+    # Metrik worker dicatat di recorder sendiri lalu dikirim balik ke induk.
+    recorder = MetricsRecorder()
+    with recorder.stage("transform", partition=number, path=partition.path) as record:
+        df = read_partition(partition)
+        collector = _PartitionHashes()
+        timings = {} if profile else None
+        cleaned = plan.run(df, collector, timings, converter)
+        record.rows_in, record.rows_out = len(df), len(cleaned)
+
+        # Hasil dikirim balik lewat file, bukan DataFrame yang di-pickle:
+        # CSV yang sudah jadi, atau Arrow IPC yang di-memory-map induk.
+        frame = csv_path = None
+        if csv_output:
+            csv_path = os.path.join(out_dir, f"part-{number:05d}.csv")
+            cleaned.to_csv(csv_path, index=False)
+        elif pa is not None:
+            frame = os.path.join(out_dir, f"part-{number:05d}.arrow")
+            table = pa.Table.from_pandas(cleaned.reset_index(drop=True), preserve_index=False)
+            with pa.OSFile(frame, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            frame = cleaned
+    return PartitionResult(partition, len(df), len(cleaned), frame, csv_path, collector.hashes, timings,
+                           recorder.records()[0])
+
+
+def _load_frame(frame):
+    if frame is None or isinstance(frame, pd.DataFrame):
+        return frame
+    with pa.memory_map(frame, "r") as source:
+        table = ipc.open_file(source).read_all()
+    os.remove(frame)
+    return table.to_pandas()
+
+
+def _csv_records(lines):
+    """Gabungkan baris teks menjadi record CSV utuh (field ber-kutip boleh memuat newline)."""
+    record, quotes = [], 0
+    for line in lines:
+        record.append(line)
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            yield b"".join(record)
+            record, quotes = [], 0
+    if record:
+        yield b"".join(record)
+
+
+def append_csv(result, out, keep=None, header=True):
+    """Sambung CSV hasil partisi ke file ``out`` (mode biner), hanya record dengan ``keep`` ``True``.
+
+    Duplikat antar partisi dibuang per record teks tanpa parsing ulang;
+    record yang memuat newline di dalam field ber-kutip tetap utuh.
+    """
+    with open(result.csv_path, "rb") as f:
+        first = f.readline()
+        if header:
+            out.write(first)
+        if keep is None or keep.all():
+            shutil.copyfileobj(f, out)
+        else:
+            out.writelines(compress(_csv_records(f.read().splitlines(keepends=True)), keep))
+    os.remove(result.csv_path)
+
+
+def iter_cleaned_partitions(paths, workers, plan, converter=None, profile=False, csv_output=False):
+    """Bersihkan ``paths`` per partisi di ``workers`` proses; yield ``PartitionResult`` sesuai urutan input.
+
+    Setiap worker membaca partisinya sendiri dari file dan menjalankan
+    ``plan`` lengkap dengan dedup di dalam partisinya. Hash baris mentah yang
+    tersisa ikut dikembalikan agar pemanggil bisa membuang duplikat antar
+    partisi (``hashes`` bernilai ``None`` jika plan tidak punya
+    ``drop_duplicates``). Dengan ``csv_output`` worker langsung menulis CSV
+    (lihat ``append_csv``) agar serialisasi output juga berjalan paralel.
+    """
+    partitions = plan_partitions(paths, workers)
+    with tempfile.TemporaryDirectory(prefix="etl-partitions-") as out_dir, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_clean_partition, number, partition, plan, converter, out_dir, profile, csv_output)
+            for number, partition in enumerate(partitions)
+        ]
+        try:
+            for future in futures:
+                result = future.result()
+                result.frame = _load_frame(result.frame)
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,205 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Agar tetap bisa dijalankan langsung: python utils/pipeline.py
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.cdc import CDC_DB, SnapshotIndex
+from utils.extract import iter_fashion_pages
+from utils.columnar import columnar_appender, is_columnar, raw_schema
+from utils.currency import DEFAULT_TTL, make_converter
+from utils.load import LOAD_METHODS, LOAD_MODES, CsvSink, GSheetSink, ParquetSink, PostgresSink, SqliteSink
+from utils.metrics import METRICS, configure_logging, get_logger
+from utils.parsers import PARSER_ENGINES
+from utils.transform import RowDeduper, clean_frame, records_to_frame
+
+logger = get_logger("pipeline")
+
+
+def iter_product_batches(pages, batch_size=500):
+    """Mengelompokkan produk dari iterator ``Page`` menjadi list berukuran ``batch_size``."""
+    buffer = []
+    for page in pages:
+        buffer.extend(page.products)
+        while len(buffer) >= batch_size:
+            yield buffer[:batch_size]
+            del buffer[:batch_size]
+    if buffer:
+        yield buffer
+
+
+def iter_tracked_pages(pages, crawl):
+    """Yield ``pages`` sambil mencatat di ``crawl["complete"]`` apakah crawl lengkap.
+
+    Crawl lengkap jika setiap halaman adalah ``next_href`` halaman sebelumnya
+    (tidak ada halaman gagal yang dilewati mode konkuren) dan halaman
+    terakhir tidak punya ``next_href`` (crawl sekuensial tidak berhenti di
+    tengah karena fetch gagal).
+    """
+    crawl["complete"] = False
+    previous = root = None
+    contiguous = True
+    for page in pages:
+        if previous is None:
+            root = page.url.rstrip("/")
+        else:
+            contiguous = contiguous and page.url == root + (previous.next_href or "")
+        previous = page
+        yield page
+    crawl["complete"] = previous is not None and contiguous and not previous.next_href
+
+
+def run_pipeline(sinks, batch_size=500, raw_csv_path=None, converter=None, changes=None, **scrape_kwargs):
+    """Menjalankan extract -> transform -> load secara streaming per batch.
+
+    Produk dari scraper dibersihkan dan dikirim ke setiap sink (objek dengan
+    ``write(df)`` dan ``close()``) begitu satu batch terkumpul, sehingga
+    memori tetap sebesar satu batch dan baris pertama sudah sampai di sink
+    sebelum crawl selesai. Duplikat antar batch dibuang dengan ``RowDeduper``.
+    ``raw_csv_path`` opsional menyimpan data mentah untuk debugging (CSV,
+    atau Parquet/Arrow IPC jika berekstensi ``.parquet``/``.arrow``). ``converter``
+    (``CurrencyConverter``) menentukan kurs konversi Price.
+
+    Dengan ``changes`` (``SnapshotIndex``) hanya produk baru atau yang
+    Price/Rating-nya berubah sejak scrape sebelumnya yang dikirim ke sink
+    yang meng-upsert (atribut ``upserts``, mis. ``SqliteSink`` atau
+    ``PostgresSink`` mode upsert); sink lain tetap menerima batch lengkap.
+    Produk yang hilang dicatat sebagai delete di riwayat dan dihapus dari
+    sink upsert lewat ``delete(df)``, hanya jika crawl lengkap sampai
+    halaman terakhir tanpa halaman gagal.
+    """
+    # Metrik dihitung per run: run berulang di satu proses tidak menumpuk record.
+    METRICS.reset()
+    deduper = RowDeduper()
+    raw_sink = None
+    if raw_csv_path:
+        raw_sink = columnar_appender(raw_csv_path, raw_schema()) if is_columnar(raw_csv_path) else CsvSink(raw_csv_path)
+    stats = {"batches": 0, "raw_rows": 0, "clean_rows": 0, "changed_rows": 0}
+    crawl = {}
+    # Dengan CDC, sink tanpa upsert tetap menerima batch lengkap: baris yang
+    # berubah saja tidak cukup untuk file/sheet yang ditulis ulang setiap run.
+    change_sinks = [sink for sink in sinks if changes is not None and getattr(sink, "upserts", False)]
+    full_sinks = [sink for sink in sinks if sink not in change_sinks]
+    try:
+        pages = iter_tracked_pages(iter_fashion_pages(**scrape_kwargs), crawl)
+        for products in iter_product_batches(pages, batch_size):
+            raw = records_to_frame(products)
+            if raw_sink is not None:
+                raw_sink.write(raw)
+
+            clean = clean_frame(raw, deduper, converter=converter)
+            rows = clean if changes is None else changes.capture(clean).rows()
+            for sink in full_sinks:
+                sink.write(clean)
+            if len(rows):
+                for sink in change_sinks:
+                    sink.write(rows)
+
+            stats["batches"] += 1
+            stats["raw_rows"] += len(raw)
+            stats["clean_rows"] += len(clean)
+            stats["changed_rows"] += len(rows)
+            logger.info("Batch %d: %d baris mentah -> %d baris bersih", stats["batches"], len(raw), len(clean))
+        if changes is not None:
+            if not crawl["complete"]:
+                logger.warning("CDC: crawl tidak lengkap (halaman gagal atau berhenti di tengah); "
+                               "deteksi produk hilang dilewati.")
+            deletes = changes.finish(detect_deletes=crawl["complete"]).deletes
+            stats["deleted_rows"] = len(deletes)
+            if len(deletes):
+                # Produk yang hilang juga dihapus dari tabel "saat ini" di sink upsert.
+                for sink in change_sinks:
+                    sink.delete(deletes)
+    finally:
+        if raw_sink is not None:
+            raw_sink.close()
+        for sink in sinks:
+            sink.close()
+        if changes is not None:
+            changes.close()
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline ETL streaming produk fashion")
+    parser.add_argument("--base-url", default="https://fashion-studio.dicoding.dev/")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--delay", type=float, default=2)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Jumlah halaman yang diambil bersamaan (dibatasi --rate-limit, default satu per --delay detik)")
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--parser", choices=sorted(PARSER_ENGINES), default=None)
+    parser.add_argument("--parse-workers", type=int, default=None, help="Jumlah proses untuk parsing halaman")
+    parser.add_argument("--clean-csv", help="Simpan data bersih ke CSV ini")
+    parser.add_argument("--clean-parquet", help="Simpan data bersih ke file Parquet bertipe ini")
+    parser.add_argument("--raw-csv", help="Simpan data mentah ke CSV/Parquet ini (debug)")
+    parser.add_argument("--cdc", nargs="?", const=str(CDC_DB),
+                        help="Database CDC (snapshot + riwayat harga, default .cache/changes.sqlite); "
+                             "hanya perubahan yang dimuat ke sink")
+    parser.add_argument("--sqlite", help="Database analitik SQLite lokal (lihat query_products/product_summary)")
+    parser.add_argument("--db-url", help="URL PostgreSQL tujuan")
+    parser.add_argument("--load-method", choices=LOAD_METHODS, default="to_sql",
+                        help="Cara memuat ke PostgreSQL (copy = COPY FROM STDIN)")
+    parser.add_argument("--load-mode", choices=LOAD_MODES, default="append",
+                        help="append menambah baris, upsert memperbarui produk yang sudah ada")
+    parser.add_argument("--spreadsheet-id", help="ID Google Sheets tujuan")
+    parser.add_argument("--credentials-file", default="./google-sheets-api.json")
+    parser.add_argument("--rates-file", help="File kurs CSV/JSON berkolom date,currency,rate")
+    parser.add_argument("--rates-url", help="URL layanan kurs (JSON list date/currency/rate)")
+    parser.add_argument("--rates-ttl", type=float, default=DEFAULT_TTL, help="Umur cache kurs (detik)")
+    parser.add_argument("--log-level", default="INFO", help="Level log (DEBUG, INFO, WARNING, ...)")
+    parser.add_argument("--metrics-out", help="Simpan metrik per stage ke file .jsonl atau .prom (Prometheus)")
+    parser.add_argument("--gsheet-sync", action="store_true",
+                        help="Kirim hanya baris yang berubah sejak push terakhir ke Google Sheets")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+    sinks = []
+    if args.clean_csv:
+        sinks.append(CsvSink(args.clean_csv))
+    if args.clean_parquet:
+        sinks.append(ParquetSink(args.clean_parquet))
+    if args.sqlite:
+        sinks.append(SqliteSink(args.sqlite))
+    if args.db_url:
+        sinks.append(PostgresSink(args.db_url, method=args.load_method, mode=args.load_mode))
+    if args.spreadsheet_id:
+        sinks.append(GSheetSink(args.spreadsheet_id, credentials_file=args.credentials_file,
+                                sync=args.gsheet_sync))
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    if not sinks:
+        sinks.append(CsvSink(os.path.join(base_dir, "cleaned_fashion_products.csv")))
+
+    stats = run_pipeline(
+        sinks,
+        batch_size=args.batch_size,
+        raw_csv_path=args.raw_csv,
+        changes=SnapshotIndex(args.cdc) if args.cdc else None,
+        converter=make_converter(args.rates_file, args.rates_url, os.path.join(base_dir, ".cache", "rates.json"),
+                                 args.rates_ttl),
+        base_url=args.base_url,
+        delay=args.delay,
+        workers=args.workers,
+        rate_limit=args.rate_limit,
+        parser=args.parser,
+        parse_workers=args.parse_workers,
+    )
+    logger.info("Pipeline selesai: %d baris mentah, %d baris bersih dalam %d batch.",
+                stats["raw_rows"], stats["clean_rows"], stats["batches"])
+    if args.cdc:
+        logger.info("CDC: %d baris baru/berubah dimuat, %d produk hilang.", stats["changed_rows"],
+                    stats.get("deleted_rows", 0))
+    for name, total in METRICS.summary().items():
+        logger.info("  %-14s %6d x %8.2fs wall %8.2fs cpu", name, total["calls"], total["wall_seconds"],
+                    total["cpu_seconds"])
+    if args.metrics_out:
+        METRICS.export(args.metrics_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from utils.parsers import PRODUCT_FIELDS
+
+# Kolom dengan sedikit nilai unik disimpan sebagai kode int32 + kamus nilai
+# (dictionary encoding): "Size: M", "Gender: Men", ... hanya ada satu objek
+# string per nilai, dan Timestamp hanya satu per halaman. Title dan Price
+# hampir unik per produk sehingga cukup disimpan sebagai list biasa.
+DICTIONARY_FIELDS = ("Rating", "Colors", "Size", "Gender", "Timestamp")
+
+
+class _DictionaryColumn:
+    def __init__(self):
+        self.codes = array("i")
+        self.values = []
+        self._index = {}
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def to_numpy(self):
+        # Hasilnya array object yang menunjuk ke string yang sama di ``values``.
+        return np.array(self.values, dtype=object)[self._codes()]
+
+    def to_categorical(self):
+        return pd.Categorical.from_codes(self._codes(), pd.Index(self.values, dtype=object))
+
+    def _codes(self):
+        # Dibaca langsung dari buffer ``array`` tanpa salinan.
+        return np.frombuffer(self.codes, dtype=np.int32)
+
+
+class ProductBuffer:
+    """Penampung produk kolumnar untuk crawl besar, pengganti list dict per produk.
+
+    Setiap field disimpan per kolom: Title/Price sebagai list string, kolom
+    lain sebagai kode ``int32`` ke kamus nilai unik. Satu produk memakan
+    sekitar dua pointer + 20 byte kode, bukan satu dict 7 key beserta string
+    miliknya sendiri.
+    """
+
+    def __init__(self):
+        self._columns = {
+            field: _DictionaryColumn() if field in DICTIONARY_FIELDS else []
+            for field in PRODUCT_FIELDS
+        }
+        self._appenders = [self._columns[field].append for field in PRODUCT_FIELDS]
+
+    def __len__(self):
+        return len(self._columns["Title"])
+
+    def append_row(self, row):
+        """Tambah satu produk sebagai tuple berurutan sesuai ``PRODUCT_FIELDS``."""
+        for append, value in zip(self._appenders, row):
+            append(value)
+
+    def extend_rows(self, rows):
+        for row in rows:
+            self.append_row(row)
+
+    def extend(self, products):
+        """Tambah produk berbentuk dict ``{field: nilai}`` (mis. ``Page.products``)."""
+        for product in products:
+            self.append_row([product.get(field) for field in PRODUCT_FIELDS])
+
+    def to_frame(self, categorical=False):
+        """DataFrame produk, sama dengan ``pd.DataFrame(list_dict)``.
+
+        Dengan ``categorical=True`` kolom kamus menjadi ``category`` yang
+        memakai buffer kode langsung tanpa menyalin string.
+        """
+        data = {}
+        for field, column in self._columns.items():
+            if isinstance(column, _DictionaryColumn):
+                data[field] = column.to_categorical() if categorical else column.to_numpy()
+            else:
+                data[field] = np.array(column, dtype=object)
+        return pd.DataFrame(data, columns=list(PRODUCT_FIELDS))
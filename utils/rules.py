@@ -0,0 +1,305 @@
+import json
+import re
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from utils.currency import DEFAULT_CONVERTER
+
+# Rule filter membuang baris; rule nilai mengubah nilai satu kolom; rule
+# baris memakai kolom lain (mis. kurs menurut tanggal) sehingga dijalankan
+# vektor atas baris yang tersisa setelah rule nilai.
+FILTER_RULES = ("drop_null", "drop_equal", "drop_contains", "drop_duplicates")
+VALUE_RULES = ("remove", "extract", "replace", "cast", "multiply")
+ROW_RULES = ("convert_currency",)
+CAST_TYPES = ("float", "int", "str")
+
+# Urutan eksekusi filter: perbandingan vektor yang murah lebih dulu,
+# pengecekan per nilai unik setelahnya, dan hash seluruh baris untuk
+# deduplikasi paling akhir agar hanya menghitung baris yang tersisa.
+FILTER_ORDER = {"drop_null": 0, "drop_equal": 1, "drop_contains": 2, "drop_duplicates": 3}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Satu aturan pembersihan, mis. ``Rule("drop_contains", "Price", {"value": "Unknown"})``."""
+    rule: str
+    column: str = None
+    params: dict = field(default_factory=dict, hash=False)
+
+    @classmethod
+    def from_config(cls, config):
+        """Buat ``Rule`` dari dict konfigurasi ``{"rule": ..., "column": ..., <parameter>}``."""
+        config = dict(config)
+        name = config.pop("rule", None)
+        if name not in FILTER_RULES + VALUE_RULES + ROW_RULES:
+            raise ValueError(f"Rule pembersihan tidak dikenal: {name!r}")
+        column = config.pop("column", None)
+        if column is None and name not in ("drop_null", "drop_duplicates"):
+            raise ValueError(f"Rule {name!r} membutuhkan 'column'")
+        if name == "cast" and config.get("dtype") not in CAST_TYPES:
+            raise ValueError(f"Rule 'cast' membutuhkan dtype salah satu dari {CAST_TYPES}")
+        return cls(name, column, config)
+
+    def __str__(self):
+        args = [self.column] if self.column else []
+        args += [f"{key}={value!r}" for key, value in self.params.items()]
+        return f"{self.rule}({', '.join(args)})"
+
+
+def _value_step(rule):
+    """Fungsi per nilai untuk satu rule nilai (dipanggil sekali per nilai unik)."""
+    params = rule.params
+    if rule.rule == "remove":
+        pattern = re.compile(params["pattern"])
+        return lambda v: pattern.sub("", v) if isinstance(v, str) else v
+    if rule.rule == "extract":
+        pattern = re.compile(params["pattern"])
+
+        def extract(v):
+            match = pattern.search(str(v))
+            return match.group() if match else np.nan
+        return extract
+    if rule.rule == "replace":
+        old, new = params["old"], params.get("new", "")
+        return lambda v: str(v).replace(old, new)
+    if rule.rule == "cast":
+        # "int" dikonversi lewat float dulu; NaN baru ditolak saat kolom di-cast.
+        return str if params["dtype"] == "str" else float
+    factor = params["factor"]
+    return lambda v: v * factor
+
+
+def _compose(steps):
+    if len(steps) == 1:
+        return steps[0]
+
+    def fused(v):
+        for step in steps:
+            v = step(v)
+        return v
+    return fused
+
+
+def _map_values(factorized, parse, dtype, rows=None):
+    """Terapkan ``parse`` sekali per nilai unik lalu sebarkan hasilnya lewat kode.
+
+    Jika ``rows`` (mask) diberikan, hanya nilai unik yang dipakai baris
+    tersebut yang di-parsing, sehingga nilai dari baris yang sudah dibuang
+    tidak bisa memicu error konversi. Nilai kosong (kode -1 dari
+    ``pd.factorize``) tidak di-parsing dan tetap kosong.
+    """
+    codes, uniques = factorized
+    parsed = _parsed_slots(len(uniques), dtype)
+    in_use = _in_use(codes, len(uniques), rows)
+    for i in np.flatnonzero(in_use):
+        parsed[i] = parse(uniques[i])
+    return parsed[codes]
+
+
+def _parsed_slots(n, dtype):
+    """Array hasil untuk ``n`` nilai unik plus satu slot terakhir untuk kode -1.
+
+    Kode -1 dari ``pd.factorize`` (NaN/None) otomatis menunjuk slot
+    terakhir: NaN untuk kolom nilai, ``True`` (baris dipertahankan) untuk
+    mask filter.
+    """
+    parsed = np.empty(n + 1, dtype=dtype)
+    parsed[-1] = True if parsed.dtype == bool else np.nan
+    return parsed
+
+
+def _in_use(codes, n, rows=None):
+    """Mask nilai unik yang dipakai ``rows`` (semua jika ``None``), tanpa slot kosong."""
+    if rows is None:
+        return np.ones(n, dtype=bool)
+    in_use = np.zeros(n + 1, dtype=bool)
+    in_use[codes[rows]] = True
+    return in_use[:-1]
+
+
+class CleaningPlan:
+    """Rencana eksekusi hasil kompilasi daftar ``Rule``.
+
+    Semua filter dijalankan lebih dulu (diurutkan dari yang termurah) dan
+    digabung menjadi satu mask, sehingga ekstraksi hanya mem-parsing nilai
+    unik dari baris yang tersisa. Filter ``drop_contains`` pada kolom yang
+    sama dan semua rule nilai satu kolom digabung menjadi satu fungsi per
+    nilai unik: setiap kolom cukup di-factorize sekali dan frame hanya
+    disalin sekali di akhir.
+    """
+
+    def __init__(self, rules):
+        self.rules = [rule if isinstance(rule, Rule) else Rule.from_config(rule) for rule in rules]
+        self.filters = sorted((r for r in self.rules if r.rule in FILTER_RULES), key=lambda r: FILTER_ORDER[r.rule])
+        self.contains = {}
+        for rule in self.filters:
+            if rule.rule == "drop_contains":
+                self.contains.setdefault(rule.column, []).append(rule)
+        self.columns = {}
+        for rule in self.rules:
+            if rule.rule in VALUE_RULES:
+                self.columns.setdefault(rule.column, []).append(rule)
+        self.row_rules = [rule for rule in self.rules if rule.rule in ROW_RULES]
+
+    @staticmethod
+    def _dtype(rules):
+        casts = [rule.params["dtype"] for rule in rules if rule.rule == "cast"]
+        return {"float": float, "int": float}.get(casts[-1] if casts else None, object)
+
+    def _steps(self):
+        """Langkah eksekusi: ``(jenis, kolom, rules)`` sesuai urutan plan."""
+        steps, merged = [], set()
+        for rule in self.filters:
+            if rule.rule != "drop_contains":
+                steps.append(("filter", rule.column, [rule]))
+            elif rule.column not in merged:
+                merged.add(rule.column)
+                steps.append(("filter", rule.column, self.contains[rule.column]))
+        steps += [("values", column, rules) for column, rules in self.columns.items()]
+        steps += [("rows", rule.column, [rule]) for rule in self.row_rules]
+        return steps
+
+    def explain(self, timings=None):
+        """Teks rencana eksekusi; dengan ``timings`` dari ``profile`` ditambah waktu per rule."""
+        lines, factorized = [], set()
+        for number, (kind, column, rules) in enumerate(self._steps(), start=1):
+            target = f"kolom {column}" if column else "semua kolom"
+            fused = " (digabung)" if len(rules) > 1 else ""
+            lines.append(f"{number}. {kind} {target}{fused}")
+            # Kolom di-factorize sekali, pada langkah pertama yang memakainya.
+            factorize = f"factorize({column})"
+            if timings is not None and factorize in timings and factorize not in factorized:
+                if kind == "values" or rules[0].rule == "drop_contains":
+                    factorized.add(factorize)
+                    lines.append(f"{'     ' + factorize:<60}{timings[factorize] * 1000:>10.2f} ms")
+            for rule in rules:
+                line = f"     {rule}"
+                if timings is not None and str(rule) in timings:
+                    line = f"{line:<60}{timings[str(rule)] * 1000:>10.2f} ms"
+                lines.append(line)
+        if timings is not None and "output" in timings:
+            lines.append(f"{'   salin frame hasil':<60}{timings['output'] * 1000:>10.2f} ms")
+        return "\n".join(lines)
+
+    def profile(self, df, deduper=None, converter=None):
+        """Jalankan plan sambil mengukur waktu setiap rule; ``(hasil, timings)``.
+
+        Fungsi gabungan dipecah lagi per rule agar waktunya terukur terpisah,
+        sehingga profil sedikit lebih lambat dari ``run`` tetapi hasilnya sama.
+        """
+        timings = {}
+        return self.run(df, deduper, timings, converter), timings
+
+    def run(self, df, deduper=None, timings=None, converter=None):
+        """Terapkan plan pada ``df``.
+
+        ``deduper`` (``RowDeduper``) untuk dedup lintas batch; ``converter``
+        (``CurrencyConverter``, default ``DEFAULT_CONVERTER``) untuk rule
+        ``convert_currency``.
+        """
+        keep = np.ones(len(df), dtype=bool)
+        factorized = {}
+
+        def factorize(column):
+            if column not in factorized:
+                factorized[column] = self._timed(timings, f"factorize({column})", pd.factorize, df[column])
+            return factorized[column]
+
+        for kind, column, rules in self._steps():
+            if kind == "filter":
+                keep = self._filter(df, keep, rules, factorize, deduper, timings)
+
+        converted = {}
+        for column, rules in self.columns.items():
+            values = self._apply_values(factorize(column), rules, keep, timings)
+            if any(rule.rule == "cast" and rule.params["dtype"] == "int" for rule in rules):
+                if np.isnan(values).any():
+                    raise pd.errors.IntCastingNaNError("Cannot convert non-finite values (NA or inf) to integer")
+                values = values.astype(int)
+            converted[column] = values
+
+        for rule in self.row_rules:
+            values = converted[rule.column] if rule.column in converted else df[rule.column].values[keep]
+            converted[rule.column] = self._timed(timings, rule, self._convert_currency, df, keep, values, rule,
+                                                 converter or DEFAULT_CONVERTER)
+
+        start = time.perf_counter()
+        # Satu kali salin: kolom hasil konversi diganti, kolom lain cukup difilter.
+        result = pd.DataFrame(
+            {column: converted[column] if column in converted else df[column].values[keep] for column in df.columns},
+            index=df.index[keep],
+        )
+        if timings is not None:
+            timings["output"] = time.perf_counter() - start
+        return result
+
+    @staticmethod
+    def _timed(timings, rule, func, *args):
+        if timings is None:
+            return func(*args)
+        start = time.perf_counter()
+        result = func(*args)
+        timings[str(rule)] = timings.get(str(rule), 0.0) + time.perf_counter() - start
+        return result
+
+    def _filter(self, df, keep, rules, factorize, deduper, timings):
+        rule = rules[0]
+        if rule.rule == "drop_null":
+            return keep & self._timed(timings, rule, lambda: df.notna().all(axis=1).to_numpy())
+        if rule.rule == "drop_equal":
+            return keep & self._timed(timings, rule, lambda: df[rule.column].to_numpy() != rule.params["value"])
+        if rule.rule == "drop_duplicates":
+            def unique():
+                if deduper is None:
+                    return keep & ~df.duplicated().to_numpy()
+                first = keep.copy()
+                first[keep] = deduper.first_seen(df[keep]).to_numpy()
+                return first
+            return self._timed(timings, rule, unique)
+
+        # drop_contains: semua substring kolom ini dicek dalam satu lintasan nilai unik.
+        values = factorize(rule.column)
+        if timings is None:
+            needles = [r.params["value"] for r in rules]
+            return keep & _map_values(values, lambda v: not any(n in str(v) for n in needles), bool, rows=keep)
+        for r in rules:
+            needle = r.params["value"]
+            keep = keep & self._timed(timings, r, _map_values, values, lambda v: needle not in str(v), bool, keep)
+        return keep
+
+    @staticmethod
+    def _convert_currency(df, keep, values, rule, converter):
+        params = rule.params
+        currency = df[params["currency_column"]].values[keep] if "currency_column" in params \
+            else params.get("currency", "USD")
+        dates = df[params["date_column"]].values[keep] if "date_column" in params else None
+        return converter.convert(values, currency, dates)
+
+    def _apply_values(self, values, rules, keep, timings):
+        dtype = self._dtype(rules)
+        if timings is None:
+            return _map_values(values, _compose([_value_step(rule) for rule in rules]), dtype, rows=keep)[keep]
+        # Profil: jalankan rule satu per satu pada nilai unik yang dipakai.
+        codes, uniques = values
+        in_use = _in_use(codes, len(uniques), keep)
+        current = list(uniques[in_use])
+        for rule in rules:
+            step = _value_step(rule)
+            current = self._timed(timings, rule, lambda: [step(v) for v in current])
+        parsed = _parsed_slots(len(uniques), dtype)
+        parsed[:-1][in_use] = current
+        return parsed[codes[keep]]
+
+
+def compile_rules(rules):
+    """Kompilasi daftar rule (``Rule`` atau dict konfigurasi) menjadi ``CleaningPlan``."""
+    return CleaningPlan(rules)
+
+
+def load_rules(path):
+    """Baca daftar rule dari file JSON (list dict konfigurasi)."""
+    with open(path, encoding="utf-8") as f:
+        return [Rule.from_config(config) for config in json.load(f)]
@@ -1,50 +1,287 @@
+import argparse
+import sys
+import numpy as np
 import pandas as pd
 import os
+from pathlib import Path
 
-def clean_data(input_csv_path, output_csv_path):
-    # Baca data dari hasil extract
-    df = pd.read_csv(input_csv_path)
+# Agar tetap bisa dijalankan langsung: python utils/transform.py
+sys.path.append(str(Path(__file__).parent.parent))
 
-    # Hapus data yang memiliki nilai null
-    df.dropna(inplace=True)
+from utils.columnar import (
+    clean_schema, columnar_appender, is_columnar, iter_columnar_batches, mask_missing, read_columnar,
+    write_columnar,
+)
+from utils.currency import DEFAULT_TTL, make_converter
+from utils.metrics import METRICS, configure_logging, get_logger, stage
+from utils.partitions import append_csv, iter_cleaned_partitions
+from utils.rules import compile_rules, load_rules
 
-    # Hapus data duplikat
-    df.drop_duplicates(inplace=True)
+logger = get_logger("transform")
 
-    # Hapus data dengan Title "Unknown Product"
-    df = df[df["Title"] != "Unknown Product"]
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-    # Hapus data dengan Price "Unknown Price"
-    df = df[~df["Price"].astype(str).str.contains("Unknown", na=False)]
+# Kolom hasil extract, sesuai urutan di scraped_fashion_products.csv
+RAW_COLUMNS = ["Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"]
 
-    # Bersihkan dan konversi kolom Price dari dolar ke Rupiah (USD -> IDR, kurs 16.000)
-    df["Price"] = df["Price"].replace('[\$,]', '', regex=True).astype(float) * 16000
 
-    # Hapus baris yang memiliki Rating invalid
-    df = df[~df["Rating"].astype(str).str.contains("Invalid", na=False)]
+class RowDeduper:
+    """Indeks hash baris untuk ``drop_duplicates`` yang tetap benar lintas batch/chunk.
 
-    # Bersihkan dan konversi Rating jadi float
-    df["Rating"] = df["Rating"].astype(str).str.extract(r"([\d.]+)").astype(float)
+    Setiap baris direpresentasikan oleh hash 64-bit seluruh nilainya dan
+    disimpan di beberapa array ``uint64`` terurut (digabung bertahap seperti
+    LSM), sehingga memori sekitar 8 byte per baris unik, bukan sebesar data
+    mentahnya.
+    """
 
-    # Bersihkan kolom Colors: ambil hanya angka
-    df["Colors"] = df["Colors"].astype(str).str.extract(r"(\d+)").astype(int)
+    def __init__(self):
+        self._runs = []
 
-    # Bersihkan kolom Size: hapus "Size: "
-    df["Size"] = df["Size"].astype(str).str.replace("Size: ", "", regex=False)
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
 
-    # Bersihkan kolom Gender: hapus "Gender: "
-    df["Gender"] = df["Gender"].astype(str).str.replace("Gender: ", "", regex=False)
+    def first_seen(self, df):
+        """Mask boolean: ``True`` untuk baris yang belum pernah terlihat sebelumnya."""
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return pd.Series(self.first_seen_hashes(hashes), index=df.index, dtype=bool)
 
-    # Simpan hasil transformasi ke file CSV di output path
-    df.to_csv(output_csv_path, index=False)
-    print(f"Transformasi selesai. Data bersih disimpan di '{output_csv_path}'")
-    print(df.info())
-    print(df.head())
+    def first_seen_hashes(self, hashes):
+        """Seperti ``first_seen`` untuk hash baris yang sudah dihitung (array numpy)."""
+        new = ~pd.Series(hashes).duplicated().to_numpy()
+        for run in self._runs:
+            position = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            new &= run[position] != hashes
+        self._add_run(np.sort(hashes[new]))
+        return new
 
-if __name__ == "__main__":
-    # Gunakan path relatif dari main folder
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    input_path = os.path.join(base_dir, "scraped_fashion_products.csv")
-    output_path = os.path.join(base_dir, "cleaned_fashion_products.csv")
+    def _add_run(self, run):
+        if not len(run):
+            return
+        self._runs.append(run)
+        # Gabungkan run yang ukurannya sebanding agar jumlah run tetap O(log n).
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            last = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]), kind="stable")
+
+
+def records_to_frame(products):
+    """DataFrame mentah dari list dict produk, setara dengan membaca CSV hasil extract."""
+    return mask_missing(pd.DataFrame(products, columns=RAW_COLUMNS))
+
+
+# Aturan pembersihan default dalam bentuk konfigurasi; urutan filter dan
+# penggabungan operasi per kolom ditentukan saat dikompilasi (utils.rules).
+CLEANING_RULES = [
+    # Hapus data yang memiliki nilai null dan data duplikat
+    {"rule": "drop_null"},
+    {"rule": "drop_duplicates"},
+    # Hapus Title "Unknown Product", Price "Unknown Price" dan Rating invalid
+    {"rule": "drop_equal", "column": "Title", "value": "Unknown Product"},
+    {"rule": "drop_contains", "column": "Price", "value": "Unknown"},
+    {"rule": "drop_contains", "column": "Rating", "value": "Invalid"},
+    # Price: buang simbol dolar/koma lalu konversi USD -> IDR dengan kurs
+    # yang berlaku pada Timestamp tiap baris (lihat utils.currency)
+    {"rule": "remove", "column": "Price", "pattern": r"[\$,]"},
+    {"rule": "cast", "column": "Price", "dtype": "float"},
+    {"rule": "convert_currency", "column": "Price", "currency": "USD", "date_column": "Timestamp"},
+    # Rating jadi float, Colors ambil hanya angka
+    {"rule": "extract", "column": "Rating", "pattern": r"[\d.]+"},
+    {"rule": "cast", "column": "Rating", "dtype": "float"},
+    {"rule": "extract", "column": "Colors", "pattern": r"\d+"},
+    {"rule": "cast", "column": "Colors", "dtype": "int"},
+    # Size dan Gender: hapus "Size: " / "Gender: "
+    {"rule": "replace", "column": "Size", "old": "Size: "},
+    {"rule": "replace", "column": "Gender", "old": "Gender: "},
+]
+
+DEFAULT_PLAN = compile_rules(CLEANING_RULES)
+
+
+def clean_frame(df, deduper=None, plan=None, timings=None, converter=None):
+    """Menerapkan aturan pembersihan pada satu DataFrame hasil extract.
+
+    ``plan`` (``CleaningPlan``, default ``DEFAULT_PLAN``) menjalankan semua
+    filter lebih dulu sebagai satu mask validitas, lalu mem-parsing setiap
+    nilai unik kolom sekali saja, sehingga frame hanya disalin sekali di
+    akhir. ``deduper`` (``RowDeduper``) dipakai saat data datang bertahap agar
+    baris duplikat antar batch juga terbuang. Dengan dict ``timings``, waktu
+    per rule dijumlahkan ke dalamnya (lihat ``CleaningPlan.explain``).
+    ``converter`` (``CurrencyConverter``) menentukan kurs konversi Price;
+    defaultnya kurs tetap ``utils.currency.DEFAULT_RATES``. Setiap panggilan
+    dicatat sebagai stage ``transform`` di ``utils.metrics``.
+    """
+    with stage("transform") as record:
+        record.rows_in = len(df)
+        cleaned = (plan or DEFAULT_PLAN).run(df, deduper, timings, converter)
+        record.rows_out = len(cleaned)
+    return cleaned
+
+
+def _as_paths(input_csv_path):
+    if isinstance(input_csv_path, (str, os.PathLike)):
+        return [input_csv_path]
+    return list(input_csv_path)
+
+
+def _read_input(path):
+    with stage("read", path=str(path)) as record:
+        df = mask_missing(read_columnar(path)) if is_columnar(path) else pd.read_csv(path)
+        record.bytes = os.path.getsize(path)
+        record.rows_out = len(df)
+    return df
+
+
+def _iter_input_chunks(path, chunksize):
+    if is_columnar(path):
+        return (mask_missing(batch) for batch in iter_columnar_batches(path, chunksize))
+    # dtype=str agar hash baris yang sama tidak berbeda hanya karena
+    # inferensi tipe per chunk; aturan pembersihan tetap menghasilkan
+    # nilai dan tipe yang sama seperti mode biasa.
+    return pd.read_csv(path, chunksize=chunksize, dtype=str)
+
+
+def _write_batches(batches, output_path):
+    """Tulis ``(rows_in, frame bersih)`` bertahap ke ``output_path``; ``(rows_in, rows_out)``."""
+    writer = columnar_appender(output_path, clean_schema()) if is_columnar(output_path) else None
+    rows_in = rows_out = 0
+    for batch_rows, cleaned in batches:
+        with stage("write", path=str(output_path)) as record:
+            if writer is not None:
+                writer.write(cleaned)
+            else:
+                cleaned.to_csv(output_path, mode="a" if rows_out else "w", header=not rows_out, index=False)
+            record.rows_in = len(cleaned)
+        rows_in += batch_rows
+        rows_out += len(cleaned)
+    if writer is not None:
+        writer.close()
+    return rows_in, rows_out
+
+
+def _clean_data_chunked(paths, output_path, chunksize, plan=None, timings=None, converter=None):
+    deduper = RowDeduper()
+    batches = (
+        (len(chunk), clean_frame(chunk, deduper, plan, timings, converter))
+        for path in paths for chunk in _iter_input_chunks(path, chunksize)
+    )
+    rows_in, rows_out = _write_batches(batches, output_path)
+    logger.info("Transformasi selesai. %d baris dibaca, %d baris bersih disimpan di '%s'", rows_in, rows_out, output_path)
+    logger.info("Indeks deduplikasi: %d baris unik", len(deduper))
 
-    clean_data(input_path, output_path)
+
+def _clean_data_partitioned(paths, output_path, workers, plan=None, timings=None, converter=None):
+    deduper = RowDeduper()
+    csv_output = not is_columnar(output_path)
+    results = iter_cleaned_partitions(paths, workers, plan or DEFAULT_PLAN, converter, timings is not None, csv_output)
+
+    def deduplicated():
+        for result in results:
+            METRICS.add(result.record)
+            for name, seconds in (result.timings or {}).items():
+                timings[name] = timings.get(name, 0.0) + seconds
+            # Dedup global: partisi diproses sesuai urutan input sehingga
+            # kemunculan pertama yang dipertahankan sama seperti mode biasa.
+            keep = deduper.first_seen_hashes(result.hashes) if result.hashes is not None else None
+            yield result, keep
+
+    if not csv_output:
+        batches = ((result.rows_in, result.frame if keep is None else result.frame[keep])
+                   for result, keep in deduplicated())
+        rows_in, rows_out = _write_batches(batches, output_path)
+    else:
+        rows_in = rows_out = 0
+        with open(output_path, "wb") as out:
+            for number, (result, keep) in enumerate(deduplicated()):
+                with stage("write", path=str(output_path)) as record:
+                    append_csv(result, out, keep, header=number == 0)
+                    record.rows_in = result.rows_out if keep is None else int(keep.sum())
+                rows_in += result.rows_in
+                rows_out += record.rows_in
+    logger.info("Transformasi selesai (%d worker). %d baris dibaca, %d baris bersih disimpan di '%s'",
+                workers, rows_in, rows_out, output_path)
+
+
+def clean_data(input_csv_path, output_csv_path, chunksize=None, plan=None, timings=None, converter=None,
+               workers=None):
+    """Membersihkan hasil extract dan menyimpannya ke ``output_csv_path``.
+
+    ``input_csv_path`` boleh berupa satu path atau beberapa path (mis. hasil
+    scraping harian untuk backfill). Dengan ``chunksize``, file dibaca dan
+    dibersihkan per chunk lalu ditambahkan ke output, sehingga memori dibatasi
+    ukuran chunk ditambah indeks hash deduplikasi, bukan ukuran file.
+
+    Path berekstensi ``.parquet`` atau ``.arrow``/``.feather`` dibaca dan
+    ditulis dalam format kolumnar bertipe (lihat ``utils.columnar``).
+    ``plan``, ``timings`` dan ``converter`` diteruskan ke ``clean_frame``.
+
+    ``workers`` > 1 mengaktifkan mode partisi: input dipecah per file dan per
+    rentang baris, setiap partisi dibaca dan dibersihkan di process pool,
+    lalu hasilnya digabung sesuai urutan input dengan deduplikasi global.
+    Hasilnya sama dengan mode biasa dan ditulis bertahap seperti mode chunk.
+    """
+    paths = _as_paths(input_csv_path)
+    if workers and workers > 1:
+        _clean_data_partitioned(paths, output_csv_path, workers, plan, timings, converter)
+        return
+    if chunksize:
+        _clean_data_chunked(paths, output_csv_path, chunksize, plan, timings, converter)
+        return
+
+    # Baca data dari hasil extract
+    if len(paths) == 1:
+        df = _read_input(paths[0])
+    else:
+        df = pd.concat([_read_input(path) for path in paths], ignore_index=True)
+
+    df = clean_frame(df, plan=plan, timings=timings, converter=converter)
+
+    # Simpan hasil transformasi ke output path
+    with stage("write", path=str(output_csv_path)) as record:
+        if is_columnar(output_csv_path):
+            write_columnar(df, output_csv_path, clean_schema())
+        else:
+            df.to_csv(output_csv_path, index=False)
+        record.rows_in = len(df)
+    logger.info("Transformasi selesai. %d baris bersih disimpan di '%s'", len(df), output_csv_path)
+    logger.debug("Tipe kolom:\n%s", df.dtypes)
+    logger.debug("%s", df.head())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transformasi data hasil scraping")
+    parser.add_argument("inputs", nargs="*", default=[os.path.join(BASE_DIR, "scraped_fashion_products.csv")])
+    parser.add_argument("--output", default=os.path.join(BASE_DIR, "cleaned_fashion_products.csv"))
+    parser.add_argument("--chunksize", type=int, default=None, help="Proses input per chunk berisi N baris")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses untuk transformasi per partisi")
+    parser.add_argument("--rules", help="File JSON berisi aturan pembersihan (default: CLEANING_RULES)")
+    parser.add_argument("--explain", action="store_true", help="Tampilkan rencana eksekusi aturan lalu keluar")
+    parser.add_argument("--profile", action="store_true", help="Tampilkan waktu per aturan setelah transformasi")
+    parser.add_argument("--rates-file", help="File kurs CSV/JSON berkolom date,currency,rate")
+    parser.add_argument("--rates-url", help="URL layanan kurs (JSON list date/currency/rate)")
+    parser.add_argument("--rates-ttl", type=float, default=DEFAULT_TTL, help="Umur cache kurs (detik)")
+    parser.add_argument("--log-level", default="INFO", help="Level log (DEBUG, INFO, WARNING, ...)")
+    parser.add_argument("--metrics-out", help="Simpan metrik per stage ke file .jsonl atau .prom (Prometheus)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Membersihkan file hasil extract dan menyimpan hasilnya."""
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+    plan = compile_rules(load_rules(args.rules)) if args.rules else DEFAULT_PLAN
+    if args.explain:
+        print(plan.explain())
+        return
+    timings = {} if args.profile else None
+    converter = make_converter(args.rates_file, args.rates_url, os.path.join(BASE_DIR, ".cache", "rates.json"),
+                               args.rates_ttl)
+    clean_data(args.inputs, args.output, chunksize=args.chunksize, plan=plan, timings=timings, converter=converter,
+               workers=args.workers)
+    if timings is not None:
+        logger.info("Profil aturan pembersihan:\n%s", plan.explain(timings))
+    if args.metrics_out:
+        METRICS.export(args.metrics_out)
+
+
+if __name__ == "__main__":
+    main()